@@ -31,6 +31,7 @@ class CartManager(CartManagerInterface):
         
         # Thread-safe storage for multiple user sessions
         self._carts: Dict[str, List[CartItem]] = defaultdict(list)
+        self._cart_quantities: Dict[str, int] = defaultdict(int)  # running item count per cart
         self._session_timestamps: Dict[str, datetime] = {}
         self._lock = threading.RLock()
         
@@ -62,7 +63,9 @@ class CartManager(CartManagerInterface):
                 current_cart = self._carts[session_id]
                 
                 # Validate add operation
-                is_valid, error_msg, suggestions = self.validator.validate_add_operation(current_cart, items)
+                is_valid, error_msg, suggestions = self.validator.validate_add_operation(
+                    current_cart, items, current_total=self._cart_quantities[session_id]
+                )
                 if not is_valid:
                     message = error_msg
                     if suggestions:
@@ -90,10 +93,12 @@ class CartManager(CartManagerInterface):
                                     message=f"Cannot add {cart_item.quantity} more {cart_item.product.name}. Maximum 100 per product."
                                 )
                             existing_item.update_quantity(new_quantity)
+                            self._cart_quantities[session_id] += cart_item.quantity
                             added_items.append(f"{cart_item.quantity} more {cart_item.product.name}")
                         else:
                             # Add new item to cart
                             current_cart.append(cart_item)
+                            self._cart_quantities[session_id] += cart_item.quantity
                             added_items.append(f"{cart_item.quantity} {cart_item.product.name}")
                     
                     except ValueError as e:
@@ -165,6 +170,7 @@ class CartManager(CartManagerInterface):
                 removed_items = []
                 for i, cart_item in reversed(items_to_remove):
                     removed_item = current_cart.pop(i)
+                    self._cart_quantities[session_id] -= removed_item.quantity
                     removed_items.append(f"{removed_item.quantity} {removed_item.product.name}")
                 
                 cart_summary = self._create_cart_summary(session_id)
@@ -226,6 +232,7 @@ class CartManager(CartManagerInterface):
                 
                 item_count = len(current_cart)
                 current_cart.clear()
+                self._cart_quantities[session_id] = 0
                 
                 return CartOperationResult(
                     success=True,
@@ -279,6 +286,7 @@ class CartManager(CartManagerInterface):
                 if new_quantity <= 0:
                     # Remove item
                     removed_item = current_cart.pop(item_index)
+                    self._cart_quantities[session_id] -= removed_item.quantity
                     message = f"Removed {removed_item.product.name} from your cart"
                 else:
                     # Update quantity
@@ -290,6 +298,7 @@ class CartManager(CartManagerInterface):
                     
                     old_quantity = cart_item.quantity
                     cart_item.update_quantity(new_quantity)
+                    self._cart_quantities[session_id] += new_quantity - old_quantity
                     message = f"Updated {cart_item.product.name} quantity from {old_quantity} to {new_quantity}"
                 
                 cart_summary = self._create_cart_summary(session_id)
@@ -380,6 +389,7 @@ class CartManager(CartManagerInterface):
         with self._lock:
             if session_id in self._carts:
                 del self._carts[session_id]
+                self._cart_quantities.pop(session_id, None)
                 if session_id in self._session_timestamps:
                     del self._session_timestamps[session_id]
                 return True
@@ -509,6 +519,7 @@ class CartManager(CartManagerInterface):
                     for session_id in expired_sessions:
                         if session_id in self._carts:
                             del self._carts[session_id]
+                        self._cart_quantities.pop(session_id, None)
                         del self._session_timestamps[session_id]
                 
             except Exception:
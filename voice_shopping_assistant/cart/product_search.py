@@ -1,14 +1,63 @@
 """Product search functionality with filtering and fuzzy matching"""
 
+import heapq
+import math
 import re
+import sys
+from operator import itemgetter
 from typing import Dict, List, Optional, Any, Tuple
 from difflib import SequenceMatcher
 from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from rapidfuzz.fuzz import ratio as _rapidfuzz_ratio
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
 
 from ..interfaces import ProductSearchInterface
 from ..models.core import Product
 
 
+# Patterns used by ProductSearch._normalize_text_for_search
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _to_cents(price: float) -> int:
+    """Quantize a catalog price to integer cents"""
+    return int(round(float(price) * 100))
+
+
+def _lower_bound_cents(price: float) -> int:
+    """Smallest cent value that satisfies ``value >= price``"""
+    return math.ceil(round(float(price) * 100, 6))
+
+
+def _upper_bound_cents(price: float) -> int:
+    """Largest cent value that satisfies ``value <= price``"""
+    return math.floor(round(float(price) * 100, 6))
+
+
+def _bloom_bits(kind: str, value: str) -> int:
+    """Two-bit Bloom signature of an attribute value within a 64-bit word"""
+    value_hash = hash((kind, value.lower()))
+    return (1 << (value_hash & 63)) | (1 << ((value_hash >> 6) & 63))
+
+
+def _attribute_bloom(product: Product) -> int:
+    """Bloom filter over a product's available colors and sizes"""
+    bloom = 0
+    for color in product.available_colors:
+        bloom |= _bloom_bits('color', color)
+    for size in product.available_sizes:
+        bloom |= _bloom_bits('size', size)
+    return bloom
+
+
 class ProductSearch(ProductSearchInterface):
     """Product search with filtering, fuzzy matching, and ranking"""
     
@@ -19,6 +68,9 @@ class ProductSearch(ProductSearchInterface):
             products: Initial product catalog (can be updated later)
         """
         self.products: List[Product] = products or []
+        self._catalog_version = 0
+        self._cached_search = lru_cache(maxsize=512)(self._search_for_version)
+        self._filters_cache: Optional[Tuple[int, Dict[str, List[str]]]] = None
         self._build_search_indices()
     
     def add_products(self, products: List[Product]) -> None:
@@ -28,7 +80,8 @@ class ProductSearch(ProductSearchInterface):
             products: List of products to add
         """
         self.products.extend(products)
-        self._build_search_indices()
+        self._catalog_version += 1
+        self._extend_search_indices(products)
     
     def update_product_catalog(self, products: List[Product]) -> None:
         """Replace entire product catalog
@@ -37,6 +90,7 @@ class ProductSearch(ProductSearchInterface):
             products: New product catalog
         """
         self.products = products
+        self._catalog_version += 1
         self._build_search_indices()
     
     def search_products(self, filters: Dict[str, Any]) -> List[Product]:
@@ -62,22 +116,21 @@ class ProductSearch(ProductSearchInterface):
         if not self.products:
             return []
         
-        # Start with all products
-        candidates = self.products.copy()
-        
-        # Apply filters
-        candidates = self._apply_filters(candidates, filters)
-        
-        # Apply fuzzy name matching if specified
-        if 'name' in filters:
-            candidates = self._apply_fuzzy_name_search(candidates, filters['name'])
-        
-        # Rank results by relevance
-        candidates = self._rank_results(candidates, filters)
-        
-        # Apply limit
-        limit = filters.get('limit', 50)
-        return candidates[:limit]
+        try:
+            filter_key = tuple(sorted(filters.items()))
+            hash(filter_key)
+        except TypeError:
+            # Unhashable filter values (e.g. list price ranges) bypass the cache
+            candidates = self._search_fused(filters)
+        else:
+            candidates = self._cached_search(self._catalog_version, filter_key)
+        
+        # Materialize products only at the boundary
+        return [self.products[i] for i in candidates]
+    
+    def clear_cache(self) -> None:
+        """Drop all memoized search results"""
+        self._cached_search.cache_clear()
     
     def get_product_by_id(self, product_id: str) -> Optional[Product]:
         """Get product by ID
@@ -88,10 +141,7 @@ class ProductSearch(ProductSearchInterface):
         Returns:
             Product if found, None otherwise
         """
-        for product in self.products:
-            if product.id == product_id:
-                return product
-        return None
+        return self._id_index.get(product_id)
     
     def fuzzy_search(self, query: str, limit: int = 10) -> List[Product]:
         """Fuzzy search for products by name and description
@@ -107,38 +157,56 @@ class ProductSearch(ProductSearchInterface):
             return []
         
         query_lower = query.lower().strip()
+        query_tokens = frozenset(query_lower.split())
+        query_len = len(query_lower)
         scored_products = []
         
-        for product in self.products:
+        # Scoring stays serial on purpose: a pair takes microseconds with RapidFuzz and
+        # holds the GIL throughout with SequenceMatcher, so threads don't help, and a
+        # process pool would pickle the string columns on every query, costing more
+        # than the scoring itself. Repeated pairs are served by the
+        # _calculate_similarity cache instead.
+        # Stream the precomputed columns together; no Product attribute lookups
+        columns = zip(self._name_l, self._cat_l, self._brand_l, self._desc_l, self._name_tokens)
+        for i, (name_lower, cat_lower, brand_lower, desc_lower, name_tokens) in enumerate(columns):
             # Calculate similarity scores
-            name_score = self._calculate_similarity(query_lower, product.name.lower())
-            category_score = self._calculate_similarity(query_lower, product.category.lower())
-            brand_score = self._calculate_similarity(query_lower, product.brand.lower())
-            
-            # Check description if available
-            desc_score = 0.0
-            if product.description:
-                desc_score = self._calculate_similarity(query_lower, product.description.lower())
-            
-            # Weighted overall score
-            overall_score = (
+            name_score = self._calculate_similarity(query_lower, name_lower)
+            category_score = self._calculate_similarity(query_lower, cat_lower)
+            brand_score = self._calculate_similarity(query_lower, brand_lower)
+            partial_score = (
                 name_score * 0.5 +           # Name is most important
                 category_score * 0.2 +       # Category is moderately important
-                brand_score * 0.2 +          # Brand is moderately important
-                desc_score * 0.1             # Description is least important
+                brand_score * 0.2            # Brand is moderately important
             )
+            # Whole query words found in the name ('shirt' no longer boosts 'sweatshirts')
+            exact_match = bool(query_tokens & name_tokens)
+            
+            # Check description if available. It is the longest field, so skip scoring
+            # it when even its length bound can't lift the product past the cutoff
+            desc_score = 0.0
+            if desc_lower:
+                desc_len = len(desc_lower)
+                desc_bound = 2.0 * min(query_len, desc_len) / (query_len + desc_len)
+                best_possible = partial_score + desc_bound * 0.1
+                if exact_match:
+                    best_possible += 0.2
+                if best_possible > 0.3:
+                    desc_score = self._calculate_similarity(query_lower, desc_lower)
+            
+            # Weighted overall score; description is least important
+            overall_score = partial_score + desc_score * 0.1
             
             # Boost score for exact word matches
-            if any(word in product.name.lower() for word in query_lower.split()):
+            if exact_match:
                 overall_score += 0.2
             
             # Only include products with reasonable similarity
             if overall_score > 0.3:
-                scored_products.append((product, overall_score))
+                scored_products.append((i, overall_score))
         
-        # Sort by score (descending) and return top results
-        scored_products.sort(key=lambda x: x[1], reverse=True)
-        return [product for product, score in scored_products[:limit]]
+        # Select the top results by score without sorting the whole tail
+        top = heapq.nlargest(limit, scored_products, key=itemgetter(1))
+        return [self.products[i] for i, score in top]
     
     def search_by_attributes(self, **attributes) -> List[Product]:
         """Search products by specific attributes
@@ -161,10 +229,14 @@ class ProductSearch(ProductSearchInterface):
         Returns:
             List of products in price range
         """
-        return self.search_products({
-            'price_min': min_price,
-            'price_max': max_price
-        })
+        if not self.products:
+            return []
+        
+        # Two binary searches over the pre-sorted prices replace a full scan
+        lo = np.searchsorted(self._price_sorted, _lower_bound_cents(min_price), side='left')
+        hi = np.searchsorted(self._price_sorted, _upper_bound_cents(max_price), side='right')
+        candidates = self._rank_results(np.sort(self._price_order[lo:hi]), 50)
+        return [self.products[i] for i in candidates]
     
     def get_available_filters(self) -> Dict[str, List[str]]:
         """Get available filter values from current catalog
@@ -172,19 +244,18 @@ class ProductSearch(ProductSearchInterface):
         Returns:
             Dictionary of filter types and their available values
         """
-        filters = {
-            'categories': list(set(p.category for p in self.products)),
-            'brands': list(set(p.brand for p in self.products)),
-            'materials': list(set(p.material for p in self.products)),
-            'colors': list(set(color for p in self.products for color in p.available_colors)),
-            'sizes': list(set(size for p in self.products for size in p.available_sizes)),
-        }
-        
-        # Sort all filter values
-        for key in filters:
-            filters[key].sort()
-        
-        return filters
+        if self._filters_cache is None or self._filters_cache[0] != self._catalog_version:
+            filters = {
+                'categories': np.unique(self._cat_arr).tolist(),
+                'brands': np.unique(self._brand_arr).tolist(),
+                'materials': np.unique(self._mat_arr).tolist(),
+                'colors': np.unique(self._all_colors).tolist(),
+                'sizes': np.unique(self._all_sizes).tolist(),
+            }
+            self._filters_cache = (self._catalog_version, filters)
+        
+        # Hand out copies so callers can't mutate the cached lists
+        return {key: list(values) for key, values in self._filters_cache[1].items()}
     
     def get_price_range(self) -> Tuple[float, float]:
         """Get price range of all products
@@ -192,11 +263,7 @@ class ProductSearch(ProductSearchInterface):
         Returns:
             Tuple of (min_price, max_price)
         """
-        if not self.products:
-            return (0.0, 0.0)
-        
-        prices = [p.price for p in self.products]
-        return (min(prices), max(prices))
+        return self._price_bounds
     
     def suggest_alternatives(self, filters: Dict[str, Any], max_suggestions: int = 5) -> List[Product]:
         """Suggest alternative products when search returns no results
@@ -227,148 +294,309 @@ class ProductSearch(ProductSearchInterface):
         
         # Last resort: return popular products (by category if specified)
         if 'category' in filters:
-            category_products = [p for p in self.products if p.category.lower() == filters['category'].lower()]
-            return category_products[:max_suggestions]
+            matches = self._category_index.get(filters['category'].lower(), [])
+            return [self.products[i] for i in matches[:max_suggestions]]
         
         # Return first few products as fallback
         return self.products[:max_suggestions]
     
-    def _build_search_indices(self) -> None:
-        """Build search indices for faster lookups"""
-        # Build category index
-        self._category_index = defaultdict(list)
-        for product in self.products:
-            self._category_index[product.category.lower()].append(product)
-        
-        # Build brand index
-        self._brand_index = defaultdict(list)
-        for product in self.products:
-            self._brand_index[product.brand.lower()].append(product)
-        
-        # Build material index
-        self._material_index = defaultdict(list)
-        for product in self.products:
-            self._material_index[product.material.lower()].append(product)
+    def _search_for_version(self, catalog_version: int,
+                            filter_items: Tuple[Tuple[str, Any], ...]) -> Tuple[int, ...]:
+        """Memoizable search entry point
+        
+        Args:
+            catalog_version: Catalog version the result is valid for
+            filter_items: Sorted filter items
+            
+        Returns:
+            Catalog indices of the ranked, limited results
+        """
+        return self._search_fused(dict(filter_items))
     
-    def _apply_filters(self, products: List[Product], filters: Dict[str, Any]) -> List[Product]:
-        """Apply all filters to product list
+    def _search_fused(self, filters: Dict[str, Any]) -> Tuple[int, ...]:
+        """Filter, fuzzy-score and rank the catalog in a single pass
         
         Args:
-            products: List of products to filter
-            filters: Filter criteria
+            filters: Search criteria (see search_products)
             
         Returns:
-            Filtered product list
+            Catalog indices of the ranked, limited results
         """
-        filtered = products
+        # Work on int32 catalog indices; products are only gathered at the API boundary
+        candidates = np.arange(len(self.products), dtype=np.int32)
+        candidates = self._apply_filters(candidates, filters)
         
-        # Category filter
-        if 'category' in filters:
-            category = filters['category'].lower()
-            filtered = [p for p in filtered if p.category.lower() == category]
+        name_scores = None
+        if 'name' in filters:
+            # Score names and drop weak matches in the same pass
+            name_scores = self._fuzzy_name_scores(candidates, filters['name'])
+            keep = name_scores > 0.4
+            candidates = candidates[keep]
+            name_scores = name_scores[keep]
+        
+        # Rank and apply limit
+        limit = filters.get('limit', 50)
+        return tuple(self._rank_results(candidates, limit, name_scores).tolist())
+    
+    def _build_search_indices(self) -> None:
+        """Build search indices for faster lookups"""
+        # ID index plus attribute indices mapping lowercased values to catalog positions
+        self._id_index: Dict[str, Product] = {}
+        self._category_index: Dict[str, List[int]] = defaultdict(list)
+        self._brand_index: Dict[str, List[int]] = defaultdict(list)
+        self._material_index: Dict[str, List[int]] = defaultdict(list)
+        
+        # Per-value product counts, used to order the color/size checks by selectivity
+        self._color_counts: Dict[str, int] = defaultdict(int)
+        self._size_counts: Dict[str, int] = defaultdict(int)
+        for index, product in enumerate(self.products):
+            self._index_one(product, index)
+        
+        for name, column in self._build_columns(self.products).items():
+            setattr(self, name, column)
+        
+        # Price order for range scans
+        self._price_order = np.argsort(self._price_cents, kind='stable').astype(np.int32)
+        self._price_sorted = self._price_cents[self._price_order]
+        self._update_price_bounds()
+    
+    def _extend_search_indices(self, products: List[Product]) -> None:
+        """Index products just appended to the catalog without a full rebuild
+        
+        Args:
+            products: Products appended to the end of self.products
+        """
+        start = len(self.products) - len(products)
+        for offset, product in enumerate(products):
+            self._index_one(product, start + offset)
+        
+        for name, column in self._build_columns(products).items():
+            setattr(self, name, np.concatenate([getattr(self, name), column]))
+        
+        # Merge the new prices into the sorted order instead of re-sorting
+        new_order = start + np.argsort(self._price_cents[start:], kind='stable').astype(np.int32)
+        new_sorted = self._price_cents[new_order]
+        positions = np.searchsorted(self._price_sorted, new_sorted, side='right')
+        self._price_order = np.insert(self._price_order, positions, new_order)
+        self._price_sorted = np.insert(self._price_sorted, positions, new_sorted)
+        self._update_price_bounds()
+    
+    def _index_one(self, product: Product, index: int) -> None:
+        """Add a single product to the dictionary indices
         
-        # Brand filter
-        if 'brand' in filters:
-            brand = filters['brand'].lower()
-            filtered = [p for p in filtered if p.brand.lower() == brand]
+        Args:
+            product: Product to index
+            index: Position of the product in self.products
+        """
+        # First occurrence wins, matching a linear scan
+        self._id_index.setdefault(product.id, product)
+        self._category_index[product.category.lower()].append(index)
+        self._brand_index[product.brand.lower()].append(index)
+        self._material_index[product.material.lower()].append(index)
+        # Colors/sizes are a small closed vocabulary; interned keys let the
+        # (also interned) query values match by identity
+        for color in {sys.intern(c.lower()) for c in product.available_colors}:
+            self._color_counts[color] += 1
+        for size in {sys.intern(s.lower()) for s in product.available_sizes}:
+            self._size_counts[size] += 1
+    
+    @staticmethod
+    def _build_columns(products: List[Product]) -> Dict[str, np.ndarray]:
+        """Build structure-of-arrays columns for a batch of products
+        
+        Args:
+            products: Products to convert
+            
+        Returns:
+            Mapping of column attribute name to array
+        """
+        count = len(products)
+        price_cents = np.fromiter(
+            (_to_cents(p.price) for p in products), dtype=np.int32, count=count
+        )
+        in_stock = np.fromiter((bool(p.in_stock) for p in products), dtype=np.bool_, count=count)
+        
+        return {
+            # Raw attribute columns backing get_available_filters
+            '_cat_arr': np.array([p.category for p in products], dtype=object),
+            '_brand_arr': np.array([p.brand for p in products], dtype=object),
+            '_mat_arr': np.array([p.material for p in products], dtype=object),
+            '_all_colors': np.array(
+                [color for p in products for color in p.available_colors], dtype=object
+            ),
+            '_all_sizes': np.array(
+                [size for p in products for size in p.available_sizes], dtype=object
+            ),
+            # Lowercased columns so queries never re-lower strings
+            '_name_l': np.array([p.name.lower() for p in products], dtype=object),
+            '_name_tokens': np.array(
+                [frozenset(p.name.lower().split()) for p in products], dtype=object
+            ),
+            '_cat_l': np.array([p.category.lower() for p in products], dtype=object),
+            '_brand_l': np.array([p.brand.lower() for p in products], dtype=object),
+            '_desc_l': np.array([(p.description or '').lower() for p in products], dtype=object),
+            '_price_cents': price_cents,
+            '_in_stock': in_stock,
+            # Per-product Bloom filter over colors and sizes
+            '_attr_bloom': np.fromiter(
+                (_attribute_bloom(p) for p in products), dtype=np.uint64, count=count
+            ),
+            # Static relevance score in cents: in-stock bonus minus price
+            '_rank_score': in_stock.astype(np.int64) * 100000 - price_cents,
+        }
+    
+    def _update_price_bounds(self) -> None:
+        """Cache the catalog price bounds from the sorted prices"""
+        if len(self._price_sorted):
+            self._price_bounds = (
+                float(self._price_sorted[0]) / 100,
+                float(self._price_sorted[-1]) / 100
+            )
+        else:
+            self._price_bounds = (0.0, 0.0)
+    
+    def _apply_filters(self, candidates: np.ndarray, filters: Dict[str, Any]) -> np.ndarray:
+        """Apply all filters to candidate products
         
-        # Material filter
-        if 'material' in filters:
-            material = filters['material'].lower()
-            filtered = [p for p in filtered if p.material.lower() == material]
+        Args:
+            candidates: Sorted catalog indices to filter
+            filters: Filter criteria
+            
+        Returns:
+            Indices of matching products in catalog order
+        """
+        # Exact-match attributes resolve through posting lists; intersecting from the
+        # smallest list keeps every later step as short as possible
+        postings = [
+            index.get(filters[key].lower(), [])
+            for key, index in (('category', self._category_index),
+                               ('brand', self._brand_index),
+                               ('material', self._material_index))
+            if key in filters
+        ]
+        for posting in sorted(postings, key=len):
+            if len(candidates) == len(self.products):
+                # Still the whole catalog, so the posting list is the intersection
+                candidates = np.array(posting, dtype=np.int32)
+            elif len(candidates):
+                candidates = np.intersect1d(candidates, posting, assume_unique=True)
         
         # Price filters
         if 'price_min' in filters:
-            min_price = float(filters['price_min'])
-            filtered = [p for p in filtered if p.price >= min_price]
+            min_cents = _lower_bound_cents(filters['price_min'])
+            candidates = candidates[self._price_cents[candidates] >= min_cents]
         
         if 'price_max' in filters:
-            max_price = float(filters['price_max'])
-            filtered = [p for p in filtered if p.price <= max_price]
+            max_cents = _upper_bound_cents(filters['price_max'])
+            candidates = candidates[self._price_cents[candidates] <= max_cents]
         
         if 'price_range' in filters:
             min_price, max_price = filters['price_range']
-            filtered = [p for p in filtered if min_price <= p.price <= max_price]
+            prices = self._price_cents[candidates]
+            candidates = candidates[(prices >= _lower_bound_cents(min_price)) &
+                                    (prices <= _upper_bound_cents(max_price))]
+        
+        # Stock filter
+        if 'in_stock' in filters:
+            candidates = candidates[self._in_stock[candidates] == bool(filters['in_stock'])]
         
-        # Color filter
+        # Multi-valued attributes still need per-product checks; run the most
+        # selective one first so the other sees fewer survivors
+        checks = []
+        query_bloom = 0
         if 'color' in filters:
-            color = filters['color'].lower()
-            filtered = [p for p in filtered if p.is_available_in_color(color)]
+            color = sys.intern(filters['color'].lower())
+            query_bloom |= _bloom_bits('color', color)
+            checks.append((self._color_counts.get(color, 0),
+                           lambda product: product.is_available_in_color(color)))
         
-        # Size filter
         if 'size' in filters:
-            size = filters['size'].lower()
-            filtered = [p for p in filtered if p.is_available_in_size(size)]
-        
-        # Stock filter
-        if 'in_stock' in filters:
-            in_stock = bool(filters['in_stock'])
-            filtered = [p for p in filtered if p.in_stock == in_stock]
+            size = sys.intern(filters['size'].lower())
+            query_bloom |= _bloom_bits('size', size)
+            checks.append((self._size_counts.get(size, 0),
+                           lambda product: product.is_available_in_size(size)))
+        
+        # Bloom prefilter rejects most non-matching products without a method call
+        if query_bloom:
+            query_bloom = np.uint64(query_bloom)
+            candidates = candidates[(self._attr_bloom[candidates] & query_bloom) == query_bloom]
+        
+        checks.sort(key=lambda check: check[0])
+        for _, matches in checks:
+            candidates = np.array(
+                [i for i in candidates if matches(self.products[i])], dtype=np.int32
+            )
         
-        return filtered
+        return candidates
     
-    def _apply_fuzzy_name_search(self, products: List[Product], query: str) -> List[Product]:
-        """Apply fuzzy name matching to products
+    def _fuzzy_name_scores(self, candidates: np.ndarray, query: str) -> np.ndarray:
+        """Score candidate product names against a query
         
         Args:
-            products: List of products to search
+            candidates: Catalog indices of products to score
             query: Search query
             
         Returns:
-            Products matching the query with similarity scores
+            Name similarity plus exact-word boost, aligned with candidates
         """
         query_lower = query.lower().strip()
-        scored_products = []
+        query_words = query_lower.split()
+        scores = np.empty(len(candidates), dtype=np.float64)
         
-        for product in products:
+        columns = zip(self._name_l[candidates], self._name_tokens[candidates])
+        for position, (name_lower, name_tokens) in enumerate(columns):
             # Calculate name similarity
-            name_similarity = self._calculate_similarity(query_lower, product.name.lower())
+            name_similarity = self._calculate_similarity(query_lower, name_lower)
             
             # Boost for exact word matches
-            query_words = query_lower.split()
-            name_words = product.name.lower().split()
-            
-            exact_matches = sum(1 for word in query_words if word in name_words)
-            word_boost = exact_matches * 0.2
-            
-            total_score = name_similarity + word_boost
+            exact_matches = sum(1 for word in query_words if word in name_tokens)
             
-            # Only include products with reasonable similarity
-            if total_score > 0.4:
-                scored_products.append((product, total_score))
+            scores[position] = name_similarity + exact_matches * 0.2
         
-        # Sort by score and return products
-        scored_products.sort(key=lambda x: x[1], reverse=True)
-        return [product for product, score in scored_products]
+        return scores
     
-    def _rank_results(self, products: List[Product], filters: Dict[str, Any]) -> List[Product]:
-        """Rank search results by relevance
+    def _rank_results(self, candidates: np.ndarray, limit: Optional[int],
+                      name_scores: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rank search results by relevance and keep the top ``limit``
         
         Args:
-            products: List of products to rank
-            filters: Original search filters
+            candidates: Catalog indices of products to rank, in catalog order
+            limit: Maximum results to return
+            name_scores: Optional fuzzy name scores aligned with candidates
             
         Returns:
-            Ranked product list
+            Ranked catalog indices
         """
         # For now, simple ranking by stock status and price
-        def rank_key(product):
-            score = 0
-            
-            # Prioritize in-stock products
-            if product.in_stock:
-                score += 1000
-            
-            # Prefer lower prices (negative to sort ascending)
-            score -= product.price
-            
-            return score
-        
-        return sorted(products, key=rank_key, reverse=True)
+        primary = -self._rank_score[candidates]
+        
+        if isinstance(limit, int) and 0 < limit < len(candidates):
+            # Partition instead of sorting the long tail, keeping every candidate
+            # tied with the limit-th best so the final order stays exact
+            threshold = np.partition(primary, limit - 1)[limit - 1]
+            keep = primary <= threshold
+            candidates, primary = candidates[keep], primary[keep]
+            if name_scores is not None:
+                name_scores = name_scores[keep]
+        
+        # Ties fall back to name similarity, then catalog order
+        if name_scores is None:
+            order = np.lexsort((candidates, primary))
+        else:
+            order = np.lexsort((candidates, -name_scores, primary))
+        return candidates[order][:limit]
     
-    def _calculate_similarity(self, text1: str, text2: str) -> float:
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def _calculate_similarity(text1: str, text2: str) -> float:
         """Calculate similarity between two text strings
         
+        Memoized across instances: (query, field) pairs repeat heavily between queries.
+        Uses RapidFuzz's bit-parallel Indel ratio when installed, which is never lower
+        than difflib's and far faster; otherwise falls back to SequenceMatcher. The two
+        can score the same pair differently, so fuzzy rankings and which products
+        clear the score cutoffs depend on whether rapidfuzz is installed.
+        
         Args:
             text1: First text string
             text2: Second text string
@@ -376,9 +604,13 @@ class ProductSearch(ProductSearchInterface):
         Returns:
             Similarity score between 0.0 and 1.0
         """
+        if RAPIDFUZZ_AVAILABLE:
+            return _rapidfuzz_ratio(text1, text2) / 100.0
         return SequenceMatcher(None, text1, text2).ratio()
     
-    def _normalize_text_for_search(self, text: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _normalize_text_for_search(text: str) -> str:
         """Normalize text for search operations
         
         Args:
@@ -391,9 +623,9 @@ class ProductSearch(ProductSearchInterface):
         text = text.lower().strip()
         
         # Remove special characters but keep spaces
-        text = re.sub(r'[^\w\s]', ' ', text)
+        text = _NON_WORD_RE.sub(' ', text)
         
         # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         
         return text
\ No newline at end of file
@@ -1,12 +1,54 @@
 """Cart operation validation and business rules"""
 
-from typing import Dict, List, Optional, Any, Tuple
+from operator import attrgetter
+from typing import Callable, Dict, List, NamedTuple, Optional, Any, Tuple
 from datetime import datetime
 
 from ..models.core import Product, CartItem, EntityType
 from ..interfaces import ProductSearchInterface
 
 
+# Static suggestion text, shared instead of rebuilt on every validation failure
+_CART_LIMIT_SUGGESTIONS = (
+    "Reduce quantities of items you're adding",
+    "Add items in smaller batches",
+)
+_EMPTY_CART_SUGGESTIONS = ("Add some items to your cart first",)
+_PRODUCT_LIMIT_SUGGESTIONS = (
+    "Remove some products from your cart",
+    "Complete this purchase and start a new cart for additional items",
+)
+_DUPLICATE_SPEC_SUGGESTION = "Choose different size or color"
+_BUDGET_STATIC_SUGGESTION = "Reduce quantities of items"
+
+# C-level attribute getters for the cart reductions below
+_quantity_of = attrgetter('quantity')
+_product_id_of = attrgetter('product.id')
+
+
+class _ItemSpec(NamedTuple):
+    """Item specification dict unpacked once for attribute access"""
+    product: Any
+    quantity: Any
+    size: Optional[str]
+    color: Optional[str]
+
+
+def _normalize_item_specs(items: List[Dict[str, Any]]) -> List[_ItemSpec]:
+    """Unpack item specification dicts, applying the usual defaults
+    
+    Args:
+        items: Item specification dicts
+        
+    Returns:
+        One _ItemSpec per item, in order
+    """
+    return [
+        _ItemSpec(item.get('product'), item.get('quantity', 1), item.get('size'), item.get('color'))
+        for item in items
+    ]
+
+
 class ValidationError(Exception):
     """Custom exception for validation errors"""
     
@@ -32,39 +74,49 @@ class CartValidator:
         self.max_item_quantity = max_item_quantity
     
     def validate_add_operation(self, current_cart: List[CartItem], 
-                             new_items: List[Dict[str, Any]]) -> Tuple[bool, str, List[str]]:
+                             new_items: List[Dict[str, Any]],
+                             current_total: Optional[int] = None) -> Tuple[bool, str, List[str]]:
         """Validate adding items to cart
         
         Args:
             current_cart: Current cart items
             new_items: Items to be added
+            current_total: Total quantity already in the cart, if the caller tracks it
             
         Returns:
             Tuple of (is_valid, error_message, suggestions)
         """
-        try:
-            # Check cart size limits
-            current_total = sum(item.quantity for item in current_cart)
-            new_total = sum(item.get('quantity', 1) for item in new_items)
-            
-            if current_total + new_total > self.max_cart_items:
-                suggestions = [
-                    f"Remove some items from your cart (currently {current_total} items)",
-                    f"Reduce quantities of items you're adding",
-                    f"Add items in smaller batches"
-                ]
-                return False, f"Cart limit exceeded. Maximum {self.max_cart_items} items allowed.", suggestions
-            
-            # Validate each item
-            for item_spec in new_items:
-                is_valid, error_msg, item_suggestions = self._validate_item_spec(item_spec, current_cart)
-                if not is_valid:
-                    return False, error_msg, item_suggestions
-            
+        # Reject malformed specs up front so the totals below can't raise
+        if not all(isinstance(item_spec, dict) for item_spec in new_items):
+            return False, "Invalid item specification", []
+        specs = _normalize_item_specs(new_items)
+        if not all(isinstance(spec.quantity, int) for spec in specs):
+            return False, "Quantity must be a positive integer", []
+        
+        # Check cart size limits
+        if current_total is None:
+            current_total = sum(map(_quantity_of, current_cart))
+        new_total = sum(map(_quantity_of, specs))
+        
+        if current_total + new_total > self.max_cart_items:
+            suggestions = [
+                f"Remove some items from your cart (currently {current_total} items)",
+                *_CART_LIMIT_SUGGESTIONS
+            ]
+            message = f"Cart limit exceeded. Maximum {self.max_cart_items} items allowed."
+            return False, message, suggestions
+        
+        # Nothing to add (e.g. a retried request) - no per-item checks to run
+        if not new_items:
             return True, "", []
-            
-        except Exception as e:
-            return False, f"Validation error: {str(e)}", []
+        
+        # Validate each item
+        for spec in specs:
+            is_valid, error_msg, item_suggestions = self._validate_item_spec(spec, current_cart)
+            if not is_valid:
+                return False, error_msg, item_suggestions
+        
+        return True, "", []
     
     def validate_remove_operation(self, current_cart: List[CartItem], 
                                 criteria: Dict[str, Any]) -> Tuple[bool, str, List[str]]:
@@ -77,24 +129,21 @@ class CartValidator:
         Returns:
             Tuple of (is_valid, error_message, suggestions)
         """
-        try:
-            if not current_cart:
-                return False, "Your cart is empty", ["Add some items to your cart first"]
-            
-            # Check if criteria will match any items
-            matching_items = []
-            for item in current_cart:
-                if self._matches_removal_criteria(item, criteria):
-                    matching_items.append(item)
-            
-            if not matching_items:
-                suggestions = self._generate_removal_suggestions(current_cart, criteria)
-                return False, "No items found matching your criteria", suggestions
-            
-            return True, "", []
-            
-        except Exception as e:
-            return False, f"Validation error: {str(e)}", []
+        if not current_cart:
+            return False, "Your cart is empty", list(_EMPTY_CART_SUGGESTIONS)
+        
+        # Text criteria are matched as substrings/lowercased, so they must be strings
+        for key in ('product_name', 'color', 'size'):
+            if key in criteria and not isinstance(criteria[key], str):
+                return False, f"Invalid {key.replace('_', ' ')} in removal criteria", []
+        
+        # Check if criteria will match any items
+        matches = self._build_removal_matcher(criteria)
+        if not any(map(matches, current_cart)):
+            suggestions = self._generate_removal_suggestions(current_cart, criteria)
+            return False, "No items found matching your criteria", suggestions
+        
+        return True, "", []
     
     def validate_inventory_availability(self, product: Product, quantity: int, 
                                      size: Optional[str] = None, 
@@ -110,33 +159,33 @@ class CartValidator:
         Returns:
             Tuple of (is_valid, error_message, suggestions)
         """
-        try:
-            # Check if product is in stock
-            if not product.in_stock:
-                suggestions = self._find_similar_products(product)
-                return False, f"{product.name} is currently out of stock", suggestions
-            
-            # Check size availability
-            if size and not product.is_available_in_size(size):
-                available_sizes = ", ".join(product.available_sizes) if product.available_sizes else "None"
-                suggestions = [f"Available sizes: {available_sizes}"]
-                return False, f"Size '{size}' is not available for {product.name}", suggestions
-            
-            # Check color availability
-            if color and not product.is_available_in_color(color):
-                available_colors = ", ".join(product.available_colors) if product.available_colors else "None"
-                suggestions = [f"Available colors: {available_colors}"]
-                return False, f"Color '{color}' is not available for {product.name}", suggestions
-            
-            # Check quantity limits
-            if quantity > self.max_item_quantity:
-                suggestions = [f"Maximum {self.max_item_quantity} items per product allowed"]
-                return False, f"Quantity {quantity} exceeds maximum limit", suggestions
-            
-            return True, "", []
-            
-        except Exception as e:
-            return False, f"Inventory validation error: {str(e)}", []
+        # Check if product is in stock
+        if not product.in_stock:
+            suggestions = self._find_similar_products(product)
+            return False, f"{product.name} is currently out of stock", suggestions
+        
+        # Check size availability
+        if size and not product.is_available_in_size(size):
+            available_sizes = (
+                ", ".join(product.available_sizes) if product.available_sizes else "None"
+            )
+            suggestions = [f"Available sizes: {available_sizes}"]
+            return False, f"Size '{size}' is not available for {product.name}", suggestions
+        
+        # Check color availability
+        if color and not product.is_available_in_color(color):
+            available_colors = (
+                ", ".join(product.available_colors) if product.available_colors else "None"
+            )
+            suggestions = [f"Available colors: {available_colors}"]
+            return False, f"Color '{color}' is not available for {product.name}", suggestions
+        
+        # Check quantity limits
+        if quantity > self.max_item_quantity:
+            suggestions = [f"Maximum {self.max_item_quantity} items per product allowed"]
+            return False, f"Quantity {quantity} exceeds maximum limit", suggestions
+        
+        return True, "", []
     
     def validate_price_constraints(self, items: List[Dict[str, Any]], 
                                  price_constraints: Optional[Dict[str, float]] = None) -> Tuple[bool, str, List[str]]:
@@ -152,43 +201,50 @@ class CartValidator:
         if not price_constraints:
             return True, "", []
         
-        try:
-            total_cost = 0.0
+        if not all(isinstance(item, dict) for item in items):
+            return False, "Invalid item specification", []
+        
+        # Read each limit once; nothing to check if none is configured
+        max_item_price = price_constraints.get('max_item_price')
+        min_item_price = price_constraints.get('min_item_price')
+        budget = price_constraints.get('budget')
+        if max_item_price is None and min_item_price is None and budget is None:
+            return True, "", []
+        
+        total_cost = 0.0
+        
+        specs = _normalize_item_specs(items)
+        for spec in specs:
+            product = spec.product
             
-            for item_spec in items:
-                product = item_spec.get('product')
-                quantity = item_spec.get('quantity', 1)
-                
-                if not isinstance(product, Product):
-                    continue
-                
-                item_cost = product.price * quantity
-                total_cost += item_cost
-                
-                # Check individual item price constraints
-                if 'max_item_price' in price_constraints:
-                    max_item_price = price_constraints['max_item_price']
-                    if product.price > max_item_price:
-                        suggestions = self._find_cheaper_alternatives(product, max_item_price)
-                        return False, f"{product.name} (₹{product.price}) exceeds maximum item price of ₹{max_item_price}", suggestions
-                
-                if 'min_item_price' in price_constraints:
-                    min_item_price = price_constraints['min_item_price']
-                    if product.price < min_item_price:
-                        suggestions = self._find_premium_alternatives(product, min_item_price)
-                        return False, f"{product.name} (₹{product.price}) is below minimum item price of ₹{min_item_price}", suggestions
+            if not isinstance(product, Product):
+                continue
             
-            # Check total budget constraint
-            if 'budget' in price_constraints:
-                budget = price_constraints['budget']
-                if total_cost > budget:
-                    suggestions = self._generate_budget_suggestions(items, budget, total_cost)
-                    return False, f"Total cost ₹{total_cost:.2f} exceeds budget of ₹{budget:.2f}", suggestions
+            if budget is not None:
+                if not isinstance(spec.quantity, (int, float)):
+                    return False, f"Invalid quantity for {product.name}", []
+                total_cost += product.price * spec.quantity
             
-            return True, "", []
+            # Check individual item price constraints
+            if max_item_price is not None and product.price > max_item_price:
+                suggestions = self._find_cheaper_alternatives(product, max_item_price)
+                message = (f"{product.name} (₹{product.price}) exceeds maximum item price "
+                           f"of ₹{max_item_price}")
+                return False, message, suggestions
             
-        except Exception as e:
-            return False, f"Price validation error: {str(e)}", []
+            if min_item_price is not None and product.price < min_item_price:
+                suggestions = self._find_premium_alternatives(product, min_item_price)
+                message = (f"{product.name} (₹{product.price}) is below minimum item price "
+                           f"of ₹{min_item_price}")
+                return False, message, suggestions
+        
+        # Check total budget constraint
+        if budget is not None and total_cost > budget:
+            suggestions = self._generate_budget_suggestions(specs, budget, total_cost)
+            message = f"Total cost ₹{total_cost:.2f} exceeds budget of ₹{budget:.2f}"
+            return False, message, suggestions
+        
+        return True, "", []
     
     def validate_business_rules(self, current_cart: List[CartItem], 
                               new_items: List[Dict[str, Any]]) -> Tuple[bool, str, List[str]]:
@@ -201,118 +257,132 @@ class CartValidator:
         Returns:
             Tuple of (is_valid, error_message, suggestions)
         """
-        try:
-            # Rule: Maximum 5 different products per cart
-            current_products = set(item.product.id for item in current_cart)
-            new_products = set(item['product'].id for item in new_items if 'product' in item)
-            total_products = len(current_products | new_products)
+        # Every new item needs a real product for the id-based rules below
+        for item in new_items:
+            if not isinstance(item, dict) or not isinstance(item.get('product'), Product):
+                return False, "Invalid product specification", []
+        
+        # Rule: Maximum 5 different products per cart
+        # (Product ids are strings, so set hashing is already the fast path here;
+        # a compiled numeric kernel would first have to map ids to integers.)
+        current_products = set(map(_product_id_of, current_cart))
+        specs = _normalize_item_specs(new_items)
+        new_products = {spec.product.id for spec in specs}
+        total_products = len(current_products) + len(new_products - current_products)
+        
+        if total_products > 5:
+            suggestions = list(_PRODUCT_LIMIT_SUGGESTIONS)
+            return False, "Maximum 5 different products allowed per cart", suggestions
+        
+        # Rule: No duplicate items with same specifications (one hash probe per new item)
+        existing_specs = {(item.product.id, item.size, item.color) for item in current_cart}
+        if not existing_specs:
+            return True, "", []
+        
+        for spec in specs:
+            product = spec.product
             
-            if total_products > 5:
+            if (product.id, spec.size, spec.color) in existing_specs:
                 suggestions = [
-                    "Remove some products from your cart",
-                    "Complete this purchase and start a new cart for additional items"
+                    f"Update quantity of existing {product.name} instead",
+                    _DUPLICATE_SPEC_SUGGESTION
                 ]
-                return False, "Maximum 5 different products allowed per cart", suggestions
-            
-            # Rule: No duplicate items with same specifications
-            for new_item in new_items:
-                product = new_item.get('product')
-                size = new_item.get('size')
-                color = new_item.get('color')
-                
-                for cart_item in current_cart:
-                    if (cart_item.product.id == product.id and
-                        cart_item.size == size and
-                        cart_item.color == color):
-                        suggestions = [
-                            f"Update quantity of existing {product.name} instead",
-                            "Choose different size or color"
-                        ]
-                        return False, f"{product.name} with same specifications already in cart", suggestions
-            
-            return True, "", []
-            
-        except Exception as e:
-            return False, f"Business rule validation error: {str(e)}", []
+                message = f"{product.name} with same specifications already in cart"
+                return False, message, suggestions
+        
+        return True, "", []
     
-    def _validate_item_spec(self, item_spec: Dict[str, Any], 
+    def _validate_item_spec(self, spec: _ItemSpec, 
                           current_cart: List[CartItem]) -> Tuple[bool, str, List[str]]:
         """Validate individual item specification
         
         Args:
-            item_spec: Item specification to validate
+            spec: Unpacked item specification to validate
             current_cart: Current cart for context
             
         Returns:
             Tuple of (is_valid, error_message, suggestions)
         """
         # Check required fields
-        if 'product' not in item_spec:
+        if spec.product is None:
             return False, "Product is required", []
         
-        product = item_spec['product']
-        if not isinstance(product, Product):
+        if not isinstance(spec.product, Product):
             return False, "Invalid product specification", []
         
-        quantity = item_spec.get('quantity', 1)
-        if not isinstance(quantity, int) or quantity <= 0:
+        if not isinstance(spec.quantity, int) or spec.quantity <= 0:
             return False, "Quantity must be a positive integer", []
         
-        size = item_spec.get('size')
-        color = item_spec.get('color')
+        # Availability checks lowercase these, so anything but text is malformed
+        if spec.size is not None and not isinstance(spec.size, str):
+            return False, "Invalid size specification", []
+        if spec.color is not None and not isinstance(spec.color, str):
+            return False, "Invalid color specification", []
         
-        # Validate inventory
-        is_valid, error_msg, suggestions = self.validate_inventory_availability(
-            product, quantity, size, color
-        )
+        # Validate inventory (_ItemSpec fields follow the method's parameter order)
+        is_valid, error_msg, suggestions = self.validate_inventory_availability(*spec)
         if not is_valid:
             return False, error_msg, suggestions
         
         return True, "", []
     
-    def _matches_removal_criteria(self, cart_item: CartItem, criteria: Dict[str, Any]) -> bool:
-        """Check if cart item matches removal criteria"""
+    @staticmethod
+    def _build_removal_matcher(criteria: Dict[str, Any]) -> Callable[[CartItem], bool]:
+        """Build a cart item predicate for removal criteria
+        
+        Only the criteria actually given become checks, and text values are
+        lowercased here once rather than for every cart item.
+        
+        Args:
+            criteria: Removal criteria with string product_name/color/size
+            
+        Returns:
+            Predicate that is True for cart items matching every criterion
+        """
+        predicates = []
+        
         # Check product name/ID
         if 'product_name' in criteria:
-            if criteria['product_name'].lower() not in cart_item.product.name.lower():
-                return False
+            name = criteria['product_name'].lower()
+            predicates.append(lambda item: name in item.product.name.lower())
         
         if 'product_id' in criteria:
-            if criteria['product_id'] != cart_item.product.id:
-                return False
+            product_id = criteria['product_id']
+            predicates.append(lambda item: product_id == item.product.id)
         
         # Check attributes
         if 'color' in criteria:
-            if not cart_item.color or criteria['color'].lower() != cart_item.color.lower():
-                return False
+            color = criteria['color'].lower()
+            predicates.append(lambda item: item.color and color == item.color.lower())
         
         if 'size' in criteria:
-            if not cart_item.size or criteria['size'].lower() != cart_item.size.lower():
-                return False
+            size = criteria['size'].lower()
+            predicates.append(lambda item: item.size and size == item.size.lower())
         
-        return True
+        return lambda item: all(predicate(item) for predicate in predicates)
     
     def _generate_removal_suggestions(self, current_cart: List[CartItem], 
                                     criteria: Dict[str, Any]) -> List[str]:
         """Generate suggestions for removal criteria that don't match"""
         suggestions = []
+        if not current_cart:
+            return suggestions
         
         # List available products
-        product_names = [item.product.name for item in current_cart]
-        if product_names:
-            suggestions.append(f"Available products: {', '.join(set(product_names))}")
+        product_names = {item.product.name for item in current_cart}
+        suggestions.append(f"Available products: {', '.join(product_names)}")
         
         # List available colors if color was specified
         if 'color' in criteria:
-            colors = [item.color for item in current_cart if item.color]
+            colors = {item.color for item in current_cart if item.color}
             if colors:
-                suggestions.append(f"Available colors: {', '.join(set(colors))}")
+                suggestions.append(f"Available colors: {', '.join(colors)}")
         
         # List available sizes if size was specified
         if 'size' in criteria:
-            sizes = [item.size for item in current_cart if item.size]
+            sizes = {item.size for item in current_cart if item.size}
             if sizes:
-                suggestions.append(f"Available sizes: {', '.join(set(sizes))}")
+                suggestions.append(f"Available sizes: {', '.join(sizes)}")
         
         return suggestions
     
@@ -370,7 +440,7 @@ class CartValidator:
         
         return suggestions
     
-    def _generate_budget_suggestions(self, items: List[Dict[str, Any]], 
+    def _generate_budget_suggestions(self, specs: List[_ItemSpec], 
                                    budget: float, current_total: float) -> List[str]:
         """Generate suggestions to fit within budget"""
         suggestions = []
@@ -378,21 +448,16 @@ class CartValidator:
         overage = current_total - budget
         suggestions.append(f"You're ₹{overage:.2f} over budget")
         
-        # Suggest removing most expensive items
-        item_costs = []
-        for item_spec in items:
-            product = item_spec.get('product')
-            quantity = item_spec.get('quantity', 1)
-            if product:
-                cost = product.price * quantity
-                item_costs.append((product.name, cost))
-        
-        if item_costs:
-            item_costs.sort(key=lambda x: x[1], reverse=True)
-            most_expensive = item_costs[0]
+        # Suggest removing the most expensive item (single pass, no full sort)
+        item_costs = (
+            (spec.product.name, spec.product.price * spec.quantity)
+            for spec in specs if isinstance(spec.product, Product)
+        )
+        most_expensive = max(item_costs, key=lambda cost: cost[1], default=None)
+        if most_expensive:
             suggestions.append(f"Consider removing {most_expensive[0]} (₹{most_expensive[1]:.2f})")
         
         # Suggest reducing quantities
-        suggestions.append("Reduce quantities of items")
+        suggestions.append(_BUDGET_STATIC_SUGGESTION)
         
         return suggestions
\ No newline at end of file
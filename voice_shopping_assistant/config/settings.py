@@ -1,13 +1,24 @@
 """Configuration management for the voice shopping assistant"""
 
 import os
+import sys
 from pathlib import Path
 from typing import Dict, Any, Optional
 import json
-from dataclasses import dataclass, asdict
+from functools import lru_cache
+from dataclasses import dataclass, fields
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+# Slotted config dataclasses where supported (dataclass(slots=...) needs Python 3.10+)
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ASRConfig:
     """ASR engine configuration"""
     whisper_model_size: str = "small"
@@ -19,7 +30,7 @@ class ASRConfig:
     google_api_key: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class NLPConfig:
     """NLP processing configuration"""
     intent_model_path: str = "distilbert-base-uncased"
@@ -30,7 +41,7 @@ class NLPConfig:
     enable_context_resolution: bool = True
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class CartConfig:
     """Cart management configuration"""
     max_cart_items: int = 50
@@ -40,7 +51,7 @@ class CartConfig:
     price_precision: int = 2
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class APIConfig:
     """API service configuration"""
     host: str = "0.0.0.0"
@@ -55,7 +66,7 @@ class APIConfig:
             self.cors_origins = ["*"]
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class PerformanceConfig:
     """Performance and optimization settings"""
     enable_caching: bool = True
@@ -66,7 +77,7 @@ class PerformanceConfig:
     cpu_threads: int = 4
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class LoggingConfig:
     """Logging configuration"""
     level: str = "INFO"
@@ -76,6 +87,54 @@ class LoggingConfig:
     backup_count: int = 5
 
 
+# Settings sections, in serialization order
+_SECTIONS = ('asr', 'nlp', 'cart', 'api', 'performance', 'logging')
+
+
+@lru_cache(maxsize=None)
+def _field_names(config_cls: type) -> frozenset:
+    """Names of the dataclass fields a config section accepts"""
+    return frozenset(field.name for field in fields(config_cls))
+
+
+def _config_to_dict(config_obj) -> Dict[str, Any]:
+    """Shallow dict of a flat config dataclass (cheaper than asdict's recursive copy)"""
+    result = {}
+    for field in fields(config_obj):
+        value = getattr(config_obj, field.name)
+        # Copy lists so callers can't mutate the live config through the dict
+        result[field.name] = list(value) if isinstance(value, list) else value
+    return result
+
+
+def _parse_bool(value: str) -> bool:
+    """Interpret an environment flag ('true' in any case enables it)"""
+    return value.lower() == 'true'
+
+
+# Environment overrides: (variable, settings section, attribute, converter)
+_ENV_BINDINGS = (
+    # ASR settings
+    ('WHISPER_MODEL_SIZE', 'asr', 'whisper_model_size', str),
+    ('WHISPER_MODEL_PATH', 'asr', 'whisper_model_path', str),
+    ('ASR_CONFIDENCE_THRESHOLD', 'asr', 'confidence_threshold', float),
+    ('GOOGLE_API_KEY', 'asr', 'google_api_key', str),
+    # NLP settings
+    ('INTENT_MODEL_PATH', 'nlp', 'intent_model_path', str),
+    ('ENTITY_MODEL_PATH', 'nlp', 'entity_model_path', str),
+    # API settings
+    ('API_HOST', 'api', 'host', str),
+    ('API_PORT', 'api', 'port', int),
+    ('API_DEBUG', 'api', 'debug', _parse_bool),
+    # Performance settings
+    ('GPU_ENABLED', 'performance', 'gpu_enabled', _parse_bool),
+    ('CPU_THREADS', 'performance', 'cpu_threads', int),
+    # Logging settings
+    ('LOG_LEVEL', 'logging', 'level', str),
+    ('LOG_FILE', 'logging', 'file_path', str),
+)
+
+
 class Settings:
     """Main settings class that manages all configuration"""
     
@@ -102,10 +161,11 @@ class Settings:
     
     def load_config(self) -> None:
         """Load configuration from JSON file"""
-        if os.path.exists(self.config_file):
+        config_path = Path(self.config_file)
+        if config_path.exists():
             try:
-                with open(self.config_file, 'r') as f:
-                    config_data = json.load(f)
+                raw = config_path.read_bytes()
+                config_data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
                 
                 # Update each section if present
                 if 'asr' in config_data:
@@ -126,64 +186,31 @@ class Settings:
     
     def _update_config(self, config_obj, config_dict: Dict[str, Any]) -> None:
         """Update configuration object with dictionary values"""
+        field_names = _field_names(type(config_obj))
         for key, value in config_dict.items():
-            if hasattr(config_obj, key):
+            if key in field_names:
                 setattr(config_obj, key, value)
     
     def _load_from_env(self) -> None:
         """Load configuration from environment variables"""
-        # ASR settings
-        if os.getenv('WHISPER_MODEL_SIZE'):
-            self.asr.whisper_model_size = os.getenv('WHISPER_MODEL_SIZE')
-        if os.getenv('WHISPER_MODEL_PATH'):
-            self.asr.whisper_model_path = os.getenv('WHISPER_MODEL_PATH')
-        if os.getenv('ASR_CONFIDENCE_THRESHOLD'):
-            self.asr.confidence_threshold = float(os.getenv('ASR_CONFIDENCE_THRESHOLD'))
-        if os.getenv('GOOGLE_API_KEY'):
-            self.asr.google_api_key = os.getenv('GOOGLE_API_KEY')
-        
-        # NLP settings
-        if os.getenv('INTENT_MODEL_PATH'):
-            self.nlp.intent_model_path = os.getenv('INTENT_MODEL_PATH')
-        if os.getenv('ENTITY_MODEL_PATH'):
-            self.nlp.entity_model_path = os.getenv('ENTITY_MODEL_PATH')
-        
-        # API settings
-        if os.getenv('API_HOST'):
-            self.api.host = os.getenv('API_HOST')
-        if os.getenv('API_PORT'):
-            self.api.port = int(os.getenv('API_PORT'))
-        if os.getenv('API_DEBUG'):
-            self.api.debug = os.getenv('API_DEBUG').lower() == 'true'
-        
-        # Performance settings
-        if os.getenv('GPU_ENABLED'):
-            self.performance.gpu_enabled = os.getenv('GPU_ENABLED').lower() == 'true'
-        if os.getenv('CPU_THREADS'):
-            self.performance.cpu_threads = int(os.getenv('CPU_THREADS'))
-        
-        # Logging settings
-        if os.getenv('LOG_LEVEL'):
-            self.logging.level = os.getenv('LOG_LEVEL')
-        if os.getenv('LOG_FILE'):
-            self.logging.file_path = os.getenv('LOG_FILE')
+        environ = os.environ
+        for env_var, section, attr, convert in _ENV_BINDINGS:
+            value = environ.get(env_var)
+            if value:
+                setattr(getattr(self, section), attr, convert(value))
     
     def save_config(self) -> None:
         """Save current configuration to JSON file"""
-        config_data = {
-            'asr': asdict(self.asr),
-            'nlp': asdict(self.nlp),
-            'cart': asdict(self.cart),
-            'api': asdict(self.api),
-            'performance': asdict(self.performance),
-            'logging': asdict(self.logging)
-        }
+        config_data = self.to_dict()
         
         # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
+        config_path = Path(self.config_file)
+        config_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(self.config_file, 'w') as f:
-            json.dump(config_data, f, indent=2)
+        if ORJSON_AVAILABLE:
+            config_path.write_bytes(orjson.dumps(config_data, option=orjson.OPT_INDENT_2))
+        else:
+            config_path.write_text(json.dumps(config_data, indent=2))
     
     def get_model_paths(self) -> Dict[str, str]:
         """Get all model paths for easy access"""
@@ -195,27 +222,29 @@ class Settings:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert all settings to dictionary"""
-        return {
-            'asr': asdict(self.asr),
-            'nlp': asdict(self.nlp),
-            'cart': asdict(self.cart),
-            'api': asdict(self.api),
-            'performance': asdict(self.performance),
-            'logging': asdict(self.logging)
-        }
+        return {section: _config_to_dict(getattr(self, section)) for section in _SECTIONS}
 
 
-# Global settings instance
-settings = Settings()
+# Config file used by the lazily created global settings instance
+_config_file: Optional[str] = None
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get the global settings instance"""
-    return settings
+    """Get the global settings instance, loading it on first use"""
+    return Settings(_config_file)
 
 
 def reload_settings(config_file: Optional[str] = None) -> Settings:
     """Reload settings from file"""
-    global settings
-    settings = Settings(config_file)
-    return settings
\ No newline at end of file
+    global _config_file
+    _config_file = config_file
+    get_settings.cache_clear()
+    return get_settings()
+
+
+def __getattr__(name: str) -> Any:
+    """Keep ``settings`` importable as a module attribute without loading at import"""
+    if name == 'settings':
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,12 +8,18 @@ including text input, product browsing, cart management, and testing tools.
 import streamlit as st
 import streamlit.components.v1
 import json
+import re
 import time
+from collections import Counter
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from itertools import chain, compress, islice
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+
+if TYPE_CHECKING:
+    # Plotly is imported where charts are drawn; this only serves annotations
+    import plotly.graph_objects as go
 
 # Import voice shopping assistant components
 import sys
@@ -29,6 +35,155 @@ from voice_shopping_assistant.models.core import Product, CartSummary
 from voice_shopping_assistant.cart.product_search import ProductSearch
 
 
+# Product keywords for add commands (order matters - more specific first)
+ADD_PRODUCT_KEYWORDS = {
+    'smartphone': ['smartphone'],  # More specific first
+    'headphones': ['headphones', 'earphones'],
+    'laptop': ['laptop'],
+    'computer': ['computer'],
+    'phone': ['phone'],  # Less specific, comes after smartphone
+    'shirt': ['shirt', 'tshirt', 't-shirt'],
+    'jeans': ['jeans'],
+    'pants': ['pants', 'trousers'],
+    'shoes': ['shoes', 'sneakers', 'boots'],
+    'dress': ['dress'],
+    'jacket': ['jacket', 'coat']
+}
+
+# Product keywords for remove commands (first matching type wins)
+REMOVE_PRODUCT_KEYWORDS = {
+    'shirt': ['shirt', 't-shirt', 'tshirt'],
+    'jeans': ['jeans', 'jean'],
+    'pants': ['pants', 'trousers'],
+    'shoes': ['shoes', 'sneakers', 'boots'],
+    'headphones': ['headphones', 'earphones'],
+    'phone': ['phone', 'smartphone'],
+    'laptop': ['laptop', 'computer'],
+    'dress': ['dress'],
+    'jacket': ['jacket', 'coat']
+}
+
+# Command phrases per intent, in priority order: when phrases of several
+# intents occur in one message, the first intent listed wins
+INTENT_KEYWORDS = {
+    'add': ['add', 'put', 'include'],
+    'remove': ['remove', 'delete', 'take out'],
+    'search': ['search', 'find', 'look for', 'show'],
+    'help': ['help', 'assist'],
+    'clear': ['clear', 'empty'],
+    'checkout': ['checkout', 'buy', 'purchase', 'order', 'pay']
+}
+
+# Product keywords for search commands (first matching type wins)
+SEARCH_PRODUCT_KEYWORDS = {
+    'jeans': ['jeans', 'jean'],
+    'shirt': ['shirt', 't-shirt', 'tshirt'],
+    'shoes': ['shoes', 'sneakers', 'boots'],
+    'headphones': ['headphones', 'earphones'],
+    'phone': ['phone', 'smartphone'],
+    'laptop': ['laptop', 'computer'],
+    'dress': ['dress'],
+    'pants': ['pants', 'trousers'],
+    'jacket': ['jacket', 'coat']
+}
+
+# Spelled-out quantities, checked in order
+QUANTITY_WORDS = {'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5}
+
+# Color words understood in chat commands; the tuple fixes the scan order
+COLOR_WORDS = (
+    'red', 'blue', 'green', 'white', 'black', 'yellow',
+    'pink', 'purple', 'orange', 'gray', 'grey'
+)
+COLOR_WORD_SET = frozenset(COLOR_WORDS)
+
+_NUMBER_RE = re.compile(r'\d+')
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+# Command phrases stripped from search requests, and an "under $N" price limit
+_SEARCH_COMMAND_RE = re.compile(r'search for|find me|look for|show me|i want|get me')
+_PRICE_LIMIT_RE = re.compile(r'under\s+\$?(\d+)')
+
+# Sidebar pages and the VoiceShoppingGUI method that renders each one;
+# the navigation selectbox is bound to session_state.current_page
+PAGE_HANDLERS = {
+    "🏠 Home": 'show_home_page',
+    "🛍️ Shop Products": 'show_products_page',
+    "🛒 Shopping Cart": 'show_cart_page',
+    "💬 Chat Interface": 'show_chat_page',
+    "🧪 Testing Tools": 'show_testing_page',
+    "📊 Analytics": 'show_analytics_page'
+}
+PAGES = tuple(PAGE_HANDLERS)
+
+# Product cards rendered per page on the Shop Products page
+PRODUCTS_PER_PAGE = 24
+
+# Most recent conversation turns rendered on the chat page
+RECENT_MESSAGES_SHOWN = 20
+
+# Cart item fields shown in cart tables, in display order
+CART_FRAME_COLUMNS = ('name', 'brand', 'category', 'price', 'quantity')
+
+# Chat reply scaffolds, filled in with str.format
+CART_REPLY = "🛒 **Your Cart ({count} items):**\n{lines}\n\n**Total: ${total:.2f}**"
+SEARCH_RESULTS_REPLY = (
+    "🔍 **Found {count} products for '{terms}'{price}:**\n\n{lines}\n\n"
+    "You can ask me to add any of these to your cart!"
+)
+SEARCH_NO_RESULTS_REPLY = (
+    "❌ Sorry, I couldn't find any products matching '{terms}'{price}'. "
+    "Try searching for shirts, electronics, or other categories!"
+)
+
+# Products listed in a chat search reply
+SEARCH_RESULTS_SHOWN = 5
+
+# Conversation turns kept per session; older turns are dropped
+MAX_CONVERSATION_HISTORY = 200
+
+
+class _KeywordScanner:
+    """Find which of a fixed set of keywords occur in a text in one regex pass
+    
+    A lookahead alternation reports a match at every position, so overlapping
+    keywords are all found; keywords hidden behind a longer one starting at the
+    same position (e.g. 'jean' in 'jeans') are added back from a prefix table.
+    """
+    
+    def __init__(self, keyword_table: Dict[str, List[str]]):
+        keywords = {kw for kws in keyword_table.values() for kw in kws}
+        alternation = '|'.join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True))
+        self._pattern = re.compile(f'(?=({alternation}))')
+        self._prefixes = {
+            kw: frozenset(other for other in keywords if kw.startswith(other))
+            for kw in keywords
+        }
+        # (table position, key) of the first table entry listing each keyword
+        self._group_rank = {}
+        for rank, (group, kws) in enumerate(keyword_table.items()):
+            for kw in kws:
+                self._group_rank.setdefault(kw, (rank, group))
+    
+    def scan(self, text: str) -> set:
+        """Get the set of keywords occurring anywhere in text"""
+        found = set()
+        for keyword in set(self._pattern.findall(text)):
+            found |= self._prefixes[keyword]
+        return found
+    
+    def first_group(self, text: str) -> Optional[str]:
+        """Get the first key of the keyword table, in table order, with a keyword in text"""
+        found = self.scan(text)
+        return min(map(self._group_rank.__getitem__, found))[1] if found else None
+
+
+_ADD_KEYWORD_SCANNER = _KeywordScanner(ADD_PRODUCT_KEYWORDS)
+_REMOVE_KEYWORD_SCANNER = _KeywordScanner(REMOVE_PRODUCT_KEYWORDS)
+_SEARCH_KEYWORD_SCANNER = _KeywordScanner(SEARCH_PRODUCT_KEYWORDS)
+_INTENT_SCANNER = _KeywordScanner(INTENT_KEYWORDS)
+
+
 # Page configuration
 st.set_page_config(
     page_title="Voice Shopping Assistant",
@@ -76,6 +231,148 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+@st.cache_data(ttl=24 * 60 * 60)
+def _cached_catalog() -> Tuple[List[Product], List[str], List[str], List[str]]:
+    """Get the sample products and their filter facets, computed once per day
+    
+    Returns:
+        Tuple of (products, categories, brands, materials)
+    """
+    products = get_sample_products()
+    categories = list(set(p.category for p in products))
+    brands = list(set(p.brand for p in products))
+    materials = list(set(p.material for p in products))
+    return products, categories, brands, materials
+
+
+class ProductIndex:
+    """Lowercased, column-wise view of the product catalog
+    
+    Built once per server process so chat handlers and filters look up
+    precomputed values instead of re-lowering product fields on every rerun.
+    """
+    
+    def __init__(self, products: List[Product]):
+        """Build the index
+        
+        Args:
+            products: Product catalog to index
+        """
+        self.products = products
+        self.positions = {p.id: i for i, p in enumerate(products)}
+        self.names_lower = [p.name.lower() for p in products]
+        self.name_positions = {}
+        for i, name in enumerate(self.names_lower):
+            self.name_positions.setdefault(name, i)
+        self.name_tokens = [tuple(name.split()) for name in self.names_lower]
+        self.colors_lower = [frozenset(c.lower() for c in p.available_colors) for p in products]
+        
+        # Filter columns as arrays so filter_products can combine boolean masks
+        self.categories_lower = np.array([p.category.lower() for p in products], dtype=object)
+        self.brands_lower = np.array([p.brand.lower() for p in products], dtype=object)
+        self.materials_lower = np.array([p.material.lower() for p in products], dtype=object)
+        self.prices = np.array([p.price for p in products], dtype=np.float64)
+        self.in_stock = np.array([bool(p.in_stock) for p in products], dtype=bool)
+        
+        # Inverted indices for chat search: positions per search category and per color word
+        self.search_category_positions = {
+            category: tuple(
+                i for i, name in enumerate(self.names_lower)
+                if any(keyword in name for keyword in keywords)
+            )
+            for category, keywords in SEARCH_PRODUCT_KEYWORDS.items()
+        }
+        color_positions = {color: set() for color in COLOR_WORDS}
+        for i, (p, tokens) in enumerate(zip(products, self.name_tokens)):
+            # A product has a color if it is offered in it or its name has the color word
+            for color in COLOR_WORD_SET.intersection(chain(p.available_colors, tokens)):
+                color_positions[color].add(i)
+        self.color_positions = {
+            color: frozenset(positions) for color, positions in color_positions.items()
+        }
+    
+    def first_match(self, predicate) -> Optional[int]:
+        """Get the position of the first lowercased name satisfying predicate"""
+        return next((i for i, name in enumerate(self.names_lower) if predicate(name)), None)
+
+
+@st.cache_data(ttl=24 * 60 * 60)
+def _cached_catalog_stats() -> Dict[str, Any]:
+    """Get the sample catalog statistics, computed once per day"""
+    return get_catalog_statistics()
+
+
+@st.cache_data(ttl=300, max_entries=256)
+def _fuzzy_match_ids(_product_search: ProductSearch, query: str, limit: int) -> List[str]:
+    """Get the IDs of fuzzy search matches, memoized per query across reruns
+    
+    Args:
+        _product_search: Search instance (not hashed; it is a cached resource)
+        query: Search query
+        limit: Maximum number of matches
+        
+    Returns:
+        Matching product IDs in rank order
+    """
+    return [p.id for p in _product_search.fuzzy_search(query, limit=limit)]
+
+
+@st.cache_data(ttl=30, max_entries=128)
+def _cached_search_reply(_gui: 'VoiceShoppingGUI', user_input: str) -> str:
+    """Get the chat reply to a search request, memoized per normalized request
+    
+    Search replies depend only on the request and the static catalog, so repeated
+    requests (e.g. the same voice transcript re-sent) skip the search pipeline.
+    
+    Args:
+        _gui: GUI instance used to run the search (not hashed)
+        user_input: Lowercased, stripped search request
+        
+    Returns:
+        Formatted search reply
+    """
+    return _gui._search_reply(user_input)
+
+
+@st.cache_resource
+def _category_pie(category_counts: Tuple[Tuple[str, int], ...]) -> 'go.Figure':
+    """Get the products-by-category pie chart for (category, count) pairs"""
+    import plotly.express as px
+    
+    categories_df = pd.DataFrame(list(category_counts), columns=['Category', 'Count'])
+    return px.pie(categories_df, values='Count', names='Category', 
+                  title="Products by Category")
+
+
+@st.cache_resource
+def _price_histogram(prices: np.ndarray) -> 'go.Figure':
+    """Get the catalog price distribution histogram"""
+    import plotly.express as px
+    
+    fig = px.histogram(x=prices, nbins=20, title="Price Distribution")
+    fig.update_layout(
+        xaxis_title="Price ($)",
+        yaxis_title="Number of Products"
+    )
+    return fig
+
+
+@st.cache_resource
+def _top_brands_bar(top_brands: Tuple[Tuple[str, int], ...]) -> 'go.Figure':
+    """Get the top-10 brands bar chart for (brand, product count) pairs, most first"""
+    import plotly.express as px
+    
+    brands_df = pd.DataFrame(list(top_brands), columns=['Brand', 'Product Count'])
+    return px.bar(brands_df, x='Brand', y='Product Count', 
+                  title="Top 10 Brands by Product Count")
+
+
+@st.cache_resource
+def _product_index() -> ProductIndex:
+    """Get the cached product index for the sample catalog"""
+    return ProductIndex(get_sample_products())
+
+
 class VoiceShoppingGUI:
     """Main GUI application class"""
     
@@ -93,6 +390,14 @@ class VoiceShoppingGUI:
         if 'cart_items' not in st.session_state:
             st.session_state.cart_items = []
         
+        if 'cart_index' not in st.session_state:
+            # product_id -> position in cart_items
+            st.session_state.cart_index = {}
+        
+        if 'cart_totals' not in st.session_state:
+            # Running aggregate over cart_items, kept in sync by the cart helpers
+            st.session_state.cart_totals = {'lines': 0, 'items': 0, 'value_cents': 0}
+        
         if 'conversation_history' not in st.session_state:
             st.session_state.conversation_history = []
         
@@ -103,7 +408,7 @@ class VoiceShoppingGUI:
             st.session_state.test_results = None
         
         if 'current_page' not in st.session_state:
-            st.session_state.current_page = "🏠 Home"
+            st.session_state.current_page = PAGES[0]
         
         if 'voice_commands_processed' not in st.session_state:
             st.session_state.voice_commands_processed = 0
@@ -132,20 +437,10 @@ class VoiceShoppingGUI:
         # Header
         st.markdown('<h1 class="main-header">🛒 Voice Shopping Assistant</h1>', 
                    unsafe_allow_html=True)
+        self._show_flash()
         
-        # Sidebar navigation
-        page = st.sidebar.selectbox(
-            "Navigate to:",
-            ["🏠 Home", "🛍️ Shop Products", "🛒 Shopping Cart", "💬 Chat Interface", 
-             "🧪 Testing Tools", "📊 Analytics"],
-            index=["🏠 Home", "🛍️ Shop Products", "🛒 Shopping Cart", "💬 Chat Interface", 
-                   "🧪 Testing Tools", "📊 Analytics"].index(st.session_state.current_page)
-        )
-        
-        # Update current page if changed
-        if page != st.session_state.current_page:
-            st.session_state.current_page = page
-            st.rerun()
+        # Sidebar navigation; the key keeps current_page in sync without an extra rerun
+        page = st.sidebar.selectbox("Navigate to:", PAGES, key="current_page")
         
         # Display session info in sidebar
         st.sidebar.markdown("---")
@@ -153,38 +448,31 @@ class VoiceShoppingGUI:
         st.sidebar.markdown(f"**Cart Items:** {len(st.session_state.cart_items)}")
         
         # Route to appropriate page
-        if page == "🏠 Home":
-            self.show_home_page()
-        elif page == "🛍️ Shop Products":
-            self.show_products_page()
-        elif page == "🛒 Shopping Cart":
-            self.show_cart_page()
-        elif page == "💬 Chat Interface":
-            self.show_chat_page()
-        elif page == "🧪 Testing Tools":
-            self.show_testing_page()
-        elif page == "📊 Analytics":
-            self.show_analytics_page()
+        getattr(self, PAGE_HANDLERS[page])()
+    
+    @staticmethod
+    def _go_to_page(page: str):
+        """Button callback switching the sidebar navigation to a page"""
+        st.session_state.current_page = page
     
     def show_home_page(self):
         """Display the home page"""
+        catalog_stats = _cached_catalog_stats()
         col1, col2, col3 = st.columns(3)
         
         with col1:
             st.markdown("### 🎯 Quick Actions")
-            if st.button("Browse Products", width="stretch"):
-                st.session_state.current_page = "🛍️ Shop Products"
-                st.rerun()
-            if st.button("View Cart", width="stretch"):
-                st.session_state.current_page = "🛒 Shopping Cart"
-                st.rerun()
-            if st.button("Start Shopping Chat", width="stretch"):
-                st.session_state.current_page = "💬 Chat Interface"
-                st.rerun()
+            # Switch pages in callbacks: they run before the navigation widget
+            # is created, so its session state may still be changed
+            st.button("Browse Products", width="stretch",
+                      on_click=self._go_to_page, args=("🛍️ Shop Products",))
+            st.button("View Cart", width="stretch",
+                      on_click=self._go_to_page, args=("🛒 Shopping Cart",))
+            st.button("Start Shopping Chat", width="stretch",
+                      on_click=self._go_to_page, args=("💬 Chat Interface",))
         
         with col2:
             st.markdown("### 📊 System Status")
-            catalog_stats = get_catalog_statistics()
             st.metric("Total Products", catalog_stats['total_products'])
             st.metric("Categories", len(catalog_stats['categories']))
             st.metric("In Stock", catalog_stats['in_stock_count'])
@@ -192,8 +480,7 @@ class VoiceShoppingGUI:
         with col3:
             st.markdown("### 🛒 Current Session")
             st.metric("Cart Items", len(st.session_state.cart_items))
-            total_value = sum(item.get('price', 0) * item.get('quantity', 1) 
-                            for item in st.session_state.cart_items)
+            _, total_value = self._cart_totals()
             st.metric("Cart Value", f"${total_value:.2f}")
         
         # Recent activity
@@ -208,20 +495,20 @@ class VoiceShoppingGUI:
         
         # Product categories overview
         st.markdown("### 🏷️ Product Categories")
-        catalog_stats = get_catalog_statistics()
         categories_df = pd.DataFrame(
             list(catalog_stats['categories'].items()),
             columns=['Category', 'Count']
         )
         
-        fig = px.bar(categories_df, x='Category', y='Count', 
-                    title="Products by Category")
-        st.plotly_chart(fig, width="stretch")
+        # Native Arrow-backed chart; a Plotly figure is overkill for a few bars
+        st.bar_chart(categories_df.set_index('Category'))
     
     def show_products_page(self):
         """Display the products browsing page"""
         st.markdown("## 🛍️ Browse Products")
         
+        _, categories, brands, materials = _cached_catalog()
+        
         # Search and filter controls
         col1, col2, col3 = st.columns([2, 1, 1])
         
@@ -230,8 +517,7 @@ class VoiceShoppingGUI:
                                        placeholder="Enter product name, brand, or description...")
         
         with col2:
-            categories = ["All"] + list(set(p.category for p in get_sample_products()))
-            selected_category = st.selectbox("Category", categories)
+            selected_category = st.selectbox("Category", ["All"] + categories)
         
         with col3:
             price_range = st.slider("Price Range", 0, 1500, (0, 1500), step=50)
@@ -241,12 +527,10 @@ class VoiceShoppingGUI:
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                brands = ["All"] + list(set(p.brand for p in get_sample_products()))
-                selected_brand = st.selectbox("Brand", brands)
+                selected_brand = st.selectbox("Brand", ["All"] + brands)
             
             with col2:
-                materials = ["All"] + list(set(p.material for p in get_sample_products()))
-                selected_material = st.selectbox("Material", materials)
+                selected_material = st.selectbox("Material", ["All"] + materials)
             
             with col3:
                 stock_filter = st.selectbox("Stock Status", ["All", "In Stock", "Out of Stock"])
@@ -260,47 +544,61 @@ class VoiceShoppingGUI:
         # Display results
         st.markdown(f"### Found {len(products)} products")
         
+        # Only render one page of cards per rerun; every card is several widgets
+        page_count = max(1, -(-len(products) // PRODUCTS_PER_PAGE))
+        page_number = 1
+        if page_count > 1:
+            page_number = st.number_input(
+                "Page", min_value=1, max_value=page_count, value=1, step=1
+            )
+            st.caption(f"Page {page_number} of {page_count}")
+        start = (page_number - 1) * PRODUCTS_PER_PAGE
+        page_products = products[start:start + PRODUCTS_PER_PAGE]
+        
         # Product grid
         cols_per_row = 3
-        for i in range(0, len(products), cols_per_row):
+        for i in range(0, len(page_products), cols_per_row):
             cols = st.columns(cols_per_row)
             
             for j, col in enumerate(cols):
-                if i + j < len(products):
-                    product = products[i + j]
+                if i + j < len(page_products):
+                    product = page_products[i + j]
                     self.display_product_card(product, col)
     
     def filter_products(self, query: str, category: str, price_range: tuple,
                        brand: str, material: str, stock_filter: str) -> List[Product]:
         """Filter products based on search criteria"""
-        products = get_sample_products()
+        catalog = _product_index()
         
-        # Text search
+        # Text search narrows the candidates to the fuzzy matches, in rank order
         if query:
-            products = self.product_search.fuzzy_search(query, limit=50)
+            match_ids = _fuzzy_match_ids(self.product_search, query, 50)
+            candidates = np.array([catalog.positions[pid] for pid in match_ids], dtype=np.intp)
+        else:
+            candidates = np.arange(len(catalog.products))
+        
+        # Price filter
+        mask = (catalog.prices >= price_range[0]) & (catalog.prices <= price_range[1])
         
         # Category filter
         if category != "All":
-            products = [p for p in products if p.category.lower() == category.lower()]
-        
-        # Price filter
-        products = [p for p in products if price_range[0] <= p.price <= price_range[1]]
+            mask &= catalog.categories_lower == category.lower()
         
         # Brand filter
         if brand != "All":
-            products = [p for p in products if p.brand.lower() == brand.lower()]
+            mask &= catalog.brands_lower == brand.lower()
         
         # Material filter
         if material != "All":
-            products = [p for p in products if p.material.lower() == material.lower()]
+            mask &= catalog.materials_lower == material.lower()
         
         # Stock filter
         if stock_filter == "In Stock":
-            products = [p for p in products if p.in_stock]
+            mask &= catalog.in_stock
         elif stock_filter == "Out of Stock":
-            products = [p for p in products if not p.in_stock]
+            mask &= ~catalog.in_stock
         
-        return products
+        return [catalog.products[i] for i in candidates[mask[candidates]]]
     
     def display_product_card(self, product: Product, container):
         """Display a product card in the given container"""
@@ -337,10 +635,23 @@ class VoiceShoppingGUI:
                     with col2:
                         if st.button("Add to Cart", key=f"add_{product.id}"):
                             self.add_to_cart(product, quantity)
-                            st.success("Added to cart!")
-                            time.sleep(1)
+                            self._flash("Added to cart!")
                             st.rerun()
     
+    def _flash(self, message: str, balloons: bool = False):
+        """Queue a toast to show after the next rerun instead of blocking on it"""
+        st.session_state.flash = (message, balloons)
+    
+    def _show_flash(self):
+        """Show and clear a message queued by _flash"""
+        flash = st.session_state.get('flash')
+        if flash:
+            st.session_state.flash = None
+            message, balloons = flash
+            st.toast(message)
+            if balloons:
+                st.balloons()
+    
     def add_to_cart(self, product: Product, quantity: int):
         """Add product to cart"""
         cart_item = {
@@ -353,31 +664,174 @@ class VoiceShoppingGUI:
         }
         
         # Check if item already exists
-        existing_item = None
-        for item in st.session_state.cart_items:
-            if item['product_id'] == product.id:
-                existing_item = item
-                break
+        position = self._cart_position(product.id)
         
-        if existing_item:
-            existing_item['quantity'] += quantity
+        if position is not None:
+            existing_item = st.session_state.cart_items[position]
+            self._set_cart_quantity(existing_item, existing_item['quantity'] + quantity)
         else:
+            st.session_state.cart_index[product.id] = len(st.session_state.cart_items)
             st.session_state.cart_items.append(cart_item)
+            self._adjust_cart_totals(cart_item, quantity, lines=1)
+    
+    def _cart_position(self, product_id: str) -> Optional[int]:
+        """Get the position of a product in the cart using the cart index"""
+        cart_items = st.session_state.cart_items
+        position = st.session_state.cart_index.get(product_id)
+        
+        # Rebuild if the cart was changed without going through the helpers below
+        if len(st.session_state.cart_index) != len(cart_items) or (
+                position is not None and cart_items[position]['product_id'] != product_id):
+            position = self._reindex_cart().get(product_id)
+        
+        return position
+    
+    def _reindex_cart(self, start: int = 0) -> Dict[str, int]:
+        """Refresh cart index positions from the given cart position onwards"""
+        cart_items = st.session_state.cart_items
+        cart_index = st.session_state.cart_index
+        if start == 0:
+            cart_index.clear()
+        
+        for i in range(start, len(cart_items)):
+            cart_index[cart_items[i]['product_id']] = i
+        
+        return cart_index
+    
+    def _pop_cart_item(self, position: int = -1) -> Dict[str, Any]:
+        """Remove and return a cart item, keeping the cart index in sync"""
+        cart_items = st.session_state.cart_items
+        if position < 0:
+            position += len(cart_items)
+        
+        removed_item = cart_items.pop(position)
+        st.session_state.cart_index.pop(removed_item['product_id'], None)
+        self._reindex_cart(position)
+        self._adjust_cart_totals(removed_item, -removed_item['quantity'], lines=-1)
+        return removed_item
+    
+    def _remove_cart_positions(self, positions: List[int]):
+        """Remove the cart items at several positions in one pass
+
+        The cart index and running totals are kept in sync.
+        """
+        if not positions:
+            return
+        
+        cart_items = st.session_state.cart_items
+        cart_index = st.session_state.cart_index
+        dropped = set(positions)
+        for position in dropped:
+            item = cart_items[position]
+            cart_index.pop(item['product_id'], None)
+            self._adjust_cart_totals(item, -item['quantity'], lines=-1)
+        
+        # Compact in place once and re-number only the items after the first gap
+        cart_items[:] = [item for i, item in enumerate(cart_items) if i not in dropped]
+        self._reindex_cart(min(dropped))
+    
+    def _clear_cart(self):
+        """Empty the cart, its index and its totals"""
+        st.session_state.cart_items.clear()
+        st.session_state.cart_index.clear()
+        st.session_state.cart_totals = {'lines': 0, 'items': 0, 'value_cents': 0}
     
+    def _set_cart_quantity(self, item: Dict[str, Any], quantity: int):
+        """Change a cart item's quantity, keeping the cart totals in sync"""
+        self._adjust_cart_totals(item, quantity - item['quantity'])
+        item['quantity'] = quantity
+    
+    def _adjust_cart_totals(self, item: Dict[str, Any], quantity_delta: int, lines: int = 0):
+        """Apply a quantity change of one cart item to the running totals"""
+        totals = st.session_state.cart_totals
+        totals['lines'] += lines
+        totals['items'] += quantity_delta
+        # Whole cents, so repeated adds and removes don't accumulate float error
+        totals['value_cents'] += round(item['price'] * 100) * quantity_delta
+    
+    def _apply_cart_edits(self, quantities: Dict[int, Any]) -> bool:
+        """
+        Apply quantity edits from the cart editor
+        
+        Args:
+            quantities: Edited quantity by cart position; positions missing from it
+                were deleted in the editor, rows past the cart end were added there
+            
+        Returns:
+            True if the cart changed
+        """
+        changed = False
+        cart_items = st.session_state.cart_items
+        removed = []
+        
+        for position, item in enumerate(cart_items):
+            quantity = quantities.get(position)
+            if quantity != quantity:
+                # Cleared cell (NaN) - keep the current quantity
+                continue
+            if quantity is None or quantity <= 0:
+                # Row deleted in the editor or quantity set to zero
+                removed.append(position)
+            elif int(quantity) != item['quantity']:
+                self._set_cart_quantity(item, int(quantity))
+                changed = True
+        
+        if removed:
+            self._remove_cart_positions(removed)
+            changed = True
+        
+        return changed
+    
+    def _cart_frame(self) -> pd.DataFrame:
+        """
+        Build a column-wise view of the cart for display
+        
+        Returns:
+            DataFrame indexed by cart position with the CART_FRAME_COLUMNS plus a
+            vectorized subtotal column
+        """
+        cart_items = st.session_state.cart_items
+        cart_df = pd.DataFrame({
+            column: [item[column] for item in cart_items]
+            for column in CART_FRAME_COLUMNS
+        })
+        cart_df['subtotal'] = cart_df['price'] * cart_df['quantity']
+        return cart_df
+    
+    def _cart_totals(self) -> Tuple[int, float]:
+        """Get the cart's (total quantity, total value) from the running totals"""
+        totals = st.session_state.cart_totals
+        cart_items = st.session_state.cart_items
+        
+        # Recompute if the cart was changed without going through the helpers above
+        if totals['lines'] != len(cart_items):
+            totals = {
+                'lines': len(cart_items),
+                'items': sum(item['quantity'] for item in cart_items),
+                'value_cents': sum(
+                    round(item['price'] * 100) * item['quantity'] for item in cart_items
+                )
+            }
+            st.session_state.cart_totals = totals
+        
+        return totals['items'], totals['value_cents'] / 100
+    
+    # Fragment: cart edits rerun only this page, not the sidebar and navigation
+    @st.fragment
     def show_cart_page(self):
         """Display the shopping cart page"""
         st.markdown("## 🛒 Shopping Cart")
+        self._show_flash()
         
         if not st.session_state.cart_items:
             st.info("Your cart is empty. Browse products to add items!")
-            if st.button("Browse Products"):
-                st.session_state.current_page = "🛍️ Shop Products"
+            # Fragment reruns don't redraw the page, so follow the callback with a full rerun
+            if st.button("Browse Products", on_click=self._go_to_page, args=("🛍️ Shop Products",)):
                 st.rerun()
             return
         
         # Cart summary
-        total_items = sum(item['quantity'] for item in st.session_state.cart_items)
-        total_value = sum(item['price'] * item['quantity'] for item in st.session_state.cart_items)
+        total_items, total_value = self._cart_totals()
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -386,40 +840,47 @@ class VoiceShoppingGUI:
             st.metric("Total Value", f"${total_value:.2f}")
         with col3:
             if st.button("Clear Cart", type="secondary"):
-                st.session_state.cart_items = []
-                st.rerun()
+                self._clear_cart()
+                st.rerun(scope="fragment")
         
         st.markdown("---")
         
-        # Cart items
-        for i, item in enumerate(st.session_state.cart_items):
-            col1, col2, col3, col4, col5 = st.columns([3, 1, 1, 1, 1])
-            
-            with col1:
-                st.markdown(f"**{item['name']}**")
-                st.markdown(f"*{item['brand']}* • {item['category']}")
-            
-            with col2:
-                st.markdown(f"${item['price']:.2f}")
-            
-            with col3:
-                new_qty = st.number_input(
-                    "Quantity", min_value=1, max_value=10, 
-                    value=item['quantity'], key=f"cart_qty_{i}"
-                )
-                if new_qty != item['quantity']:
-                    item['quantity'] = new_qty
-                    st.rerun()
-            
-            with col4:
-                st.markdown(f"${item['price'] * item['quantity']:.2f}")
-            
-            with col5:
-                if st.button("Remove", key=f"remove_{i}"):
-                    st.session_state.cart_items.pop(i)
-                    st.rerun()
-            
-            st.markdown("---")
+        # Cart items: one editor for all rows instead of a set of widgets per item.
+        # The frame's index is the cart position, so edits map straight back.
+        cart_df = self._cart_frame()
+        cart_df['remove'] = False
+        edited = st.data_editor(
+            cart_df,
+            num_rows="dynamic",
+            hide_index=True,
+            use_container_width=True,
+            disabled=['name', 'brand', 'category', 'price', 'subtotal'],
+            column_config={
+                'name': "Product",
+                'brand': "Brand",
+                'category': "Category",
+                'price': st.column_config.NumberColumn("Price", format="$%.2f"),
+                'quantity': st.column_config.NumberColumn(
+                    "Quantity", min_value=0, max_value=10, step=1
+                ),
+                'subtotal': st.column_config.NumberColumn("Subtotal", format="$%.2f"),
+                'remove': st.column_config.CheckboxColumn("Remove")
+            }
+        )
+        
+        quantities = edited['quantity'].to_dict()
+        if self._apply_cart_edits(quantities):
+            st.rerun(scope="fragment")
+        
+        # Rows added in the editor sit past the end of the cart and are ignored
+        cart_size = len(st.session_state.cart_items)
+        selected = [position for position, remove in edited['remove'].fillna(False).items()
+                    if position < cart_size and remove]
+        if st.button("Remove selected", disabled=not selected):
+            self._remove_cart_positions(selected)
+            st.rerun(scope="fragment")
+        
+        st.markdown("---")
         
         # Checkout section
         st.markdown("### 💳 Checkout")
@@ -430,12 +891,12 @@ class VoiceShoppingGUI:
         
         with col2:
             if st.button("Proceed to Checkout", type="primary"):
-                st.success("🎉 Order placed successfully!")
-                st.balloons()
-                st.session_state.cart_items = []
-                time.sleep(2)
-                st.rerun()
+                self._clear_cart()
+                self._flash("🎉 Order placed successfully!", balloons=True)
+                st.rerun(scope="fragment")
     
+    # Fragment: sending messages and quick actions rerun only this page
+    @st.fragment
     def show_chat_page(self):
         """Display the chat interface page"""
         st.markdown("## 💬 Voice Shopping Chat")
@@ -578,6 +1039,7 @@ class VoiceShoppingGUI:
         
         # Control buttons
         col1, col2, col3 = st.columns([1, 1, 2])
+        sent = False
         
         with col1:
             if st.button("Send", type="primary"):
@@ -590,12 +1052,13 @@ class VoiceShoppingGUI:
                     # Clear voice transcript after sending
                     if 'voice_transcript' in st.session_state:
                         st.session_state.voice_transcript = ""
-                    st.rerun()
+                    # The history below is drawn later in this run, so no rerun is needed
+                    sent = True
         
         with col2:
             if st.button("Clear History"):
                 st.session_state.conversation_history = []
-                st.rerun()
+                st.rerun(scope="fragment")
         
         with col3:
             if st.session_state.voice_commands_processed > 0:
@@ -606,12 +1069,21 @@ class VoiceShoppingGUI:
         # Chat history
         st.markdown("### 📝 Conversation History")
         
-        if st.session_state.conversation_history:
-            for i, msg in enumerate(reversed(st.session_state.conversation_history)):
-                with st.container():
-                    st.markdown(f"**You:** {msg['user']}")
-                    st.markdown(f"**Assistant:** {msg['assistant']}")
-                    st.markdown("---")
+        history = st.session_state.conversation_history
+        if history:
+            # One markdown element per turn, newest first; older turns on request
+            recent = history[-RECENT_MESSAGES_SHOWN:][::-1]
+            if sent:
+                # Stream the reply that was just sent
+                st.write_stream(self._turn_chunks(recent[0]))
+                recent = recent[1:]
+            for msg in recent:
+                st.markdown(self._format_turn(msg))
+            
+            older_count = len(history) - RECENT_MESSAGES_SHOWN
+            if older_count > 0 and st.checkbox(f"Show {older_count} older messages"):
+                for msg in history[-RECENT_MESSAGES_SHOWN - 1::-1]:
+                    st.markdown(self._format_turn(msg))
         else:
             st.info("Start a conversation by typing a shopping request above!")
         
@@ -622,12 +1094,12 @@ class VoiceShoppingGUI:
         with col1:
             if st.button("Show my cart"):
                 self.process_chat_message("show me my cart")
-                st.rerun()
+                st.rerun(scope="fragment")
         
         with col2:
             if st.button("Search for shirts"):
                 self.process_chat_message("search for shirts")
-                st.rerun()
+                st.rerun(scope="fragment")
         
         with col3:
             # Only show checkout button if cart has items
@@ -635,21 +1107,35 @@ class VoiceShoppingGUI:
             if cart_items_count > 0:
                 if st.button(f"Checkout ({cart_items_count} items)"):
                     self.process_chat_message("proceed to checkout")
-                    st.rerun()
+                    st.rerun(scope="fragment")
             else:
                 st.button("Checkout (empty)", disabled=True)
         
         with col4:
             if st.button("Help me shop"):
                 self.process_chat_message("help me with shopping")
-                st.rerun()
+                st.rerun(scope="fragment")
+    
+    @staticmethod
+    def _turn_chunks(msg: Dict[str, Any]):
+        """Yield one conversation turn as markdown chunks, one response line at a time"""
+        yield f"**You:** {msg['user']}\n\n**Assistant:** "
+        yield from str(msg['assistant']).splitlines(keepends=True)
+        yield "\n\n---"
+    
+    @staticmethod
+    def _format_turn(msg: Dict[str, Any]) -> str:
+        """Format one conversation turn as a single markdown block"""
+        return "".join(VoiceShoppingGUI._turn_chunks(msg))
     
     def process_chat_message(self, user_input: str, is_voice_command: bool = False):
         """Process a chat message and generate response"""
         if not user_input or not user_input.strip():
             return
         
-        # Process the command and update cart if needed
+        # Process the command and update cart if needed. This stays on the script
+        # thread: it is pure-Python, CPU-bound work that reads and writes
+        # st.session_state, and Streamlit already runs each session on its own thread.
         response = self.process_shopping_command(user_input)
         
         # Track voice commands
@@ -657,43 +1143,55 @@ class VoiceShoppingGUI:
             st.session_state.voice_commands_processed += 1
         
         # Add to conversation history
-        st.session_state.conversation_history.append({
+        history = st.session_state.conversation_history
+        history.append({
             'user': user_input,
             'assistant': response,
             'timestamp': datetime.now().isoformat(),
             'is_voice': is_voice_command
         })
+        
+        # Bound per-session memory by trimming the oldest turns in place
+        if len(history) > MAX_CONVERSATION_HISTORY:
+            del history[:-MAX_CONVERSATION_HISTORY]
+    
+    def generate_mock_response(self, user_input: str) -> str:
+        """Get the reply to a manual test command without recording it in the chat history"""
+        return self.process_shopping_command(user_input)
     
     def process_shopping_command(self, user_input: str) -> str:
         """Process a shopping command and update cart accordingly"""
         user_input_lower = user_input.lower()
         
+        # One scan for every intent phrase, then the highest-priority intent found
+        intent = _INTENT_SCANNER.first_group(user_input_lower)
+        
         # ADD commands
-        if any(word in user_input_lower for word in ['add', 'put', 'include']):
+        if intent == 'add':
             return self.handle_add_command(user_input_lower)
         
         # REMOVE commands
-        elif any(word in user_input_lower for word in ['remove', 'delete', 'take out']):
+        elif intent == 'remove':
             return self.handle_remove_command(user_input_lower)
         
         # SEARCH/SHOW commands
-        elif any(word in user_input_lower for word in ['search', 'find', 'look for', 'show']):
+        elif intent == 'search':
             if 'cart' in user_input_lower:
                 return self.handle_show_cart_command()
             else:
                 return self.handle_search_command(user_input_lower)
         
         # HELP commands
-        elif any(word in user_input_lower for word in ['help', 'assist']):
+        elif intent == 'help':
             return self.handle_help_command()
         
         # CLEAR cart commands
-        elif any(word in user_input_lower for word in ['clear', 'empty']):
+        elif intent == 'clear':
             if 'cart' in user_input_lower:
                 return self.handle_clear_cart_command()
         
         # CHECKOUT commands
-        elif any(word in user_input_lower for word in ['checkout', 'buy', 'purchase', 'order', 'pay']):
+        elif intent == 'checkout':
             return self.handle_checkout_command()
         
         else:
@@ -702,33 +1200,19 @@ class VoiceShoppingGUI:
     def handle_add_command(self, user_input: str) -> str:
         """Handle add item commands"""
         # Extract product information from the command
-        products = get_sample_products()
+        catalog = _product_index()
         
-        # Simple product matching based on keywords
+        # Simple product matching based on keywords (positions in the catalog)
         found_products = []
         
-        # Check for specific product types (order matters - more specific first)
-        product_keywords = {
-            'smartphone': ['smartphone'],  # More specific first
-            'headphones': ['headphones', 'earphones'],
-            'laptop': ['laptop'],
-            'computer': ['computer'],
-            'phone': ['phone'],  # Less specific, comes after smartphone
-            'shirt': ['shirt', 'tshirt', 't-shirt'],
-            'jeans': ['jeans'],
-            'pants': ['pants', 'trousers'],
-            'shoes': ['shoes', 'sneakers', 'boots'],
-            'dress': ['dress'],
-            'jacket': ['jacket', 'coat']
-        }
-        
         # Find the best matching product type (most specific match first)
+        found_keywords = _ADD_KEYWORD_SCANNER.scan(user_input)
         best_match = None
         best_score = 0
         
-        for product_type, keywords in product_keywords.items():
+        for product_type, keywords in ADD_PRODUCT_KEYWORDS.items():
             for keyword in keywords:
-                if keyword in user_input:
+                if keyword in found_keywords:
                     # Prefer exact matches and longer keywords
                     score = len(keyword) + (10 if user_input.count(keyword) == 1 else 0)
                     if score > best_score:
@@ -737,56 +1221,58 @@ class VoiceShoppingGUI:
         
         if best_match:
             # Find matching products for the best match only
-            keywords = product_keywords[best_match]
-            matching_products = [p for p in products if any(kw in p.name.lower() for kw in keywords)]
-            if matching_products:
-                found_products.extend(matching_products[:1])  # Only add 1 product
+            keywords = ADD_PRODUCT_KEYWORDS[best_match]
+            match = catalog.first_match(lambda name: any(kw in name for kw in keywords))
+            if match is not None:
+                found_products.append(match)  # Only add 1 product
         
         # If no specific products found, try general search
         if not found_products:
             # Look for any product name mentioned
-            for product in products:
-                if any(word in user_input for word in product.name.lower().split()):
-                    found_products.append(product)
+            for i, tokens in enumerate(catalog.name_tokens):
+                if any(word in user_input for word in tokens):
+                    found_products.append(i)
                     break
         
         # If still no products found, add a default shirt
         if not found_products:
-            default_products = [p for p in products if 'shirt' in p.name.lower()]
-            if default_products:
-                found_products = [default_products[0]]
+            match = catalog.first_match(lambda name: 'shirt' in name)
+            if match is not None:
+                found_products = [match]
+        
+        # Whole words of the command; quantity and color words must match exactly
+        # so e.g. 'phone' doesn't read as 'one' or 'ordered' as 'red'
+        words = set(_WORD_RE.findall(user_input))
         
         # Extract quantity
         quantity = 1
-        quantity_words = {'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5}
-        for word, num in quantity_words.items():
-            if word in user_input:
+        for word, num in QUANTITY_WORDS.items():
+            if word in words:
                 quantity = num
                 break
         
         # Check for numbers
-        import re
-        numbers = re.findall(r'\d+', user_input)
-        if numbers:
+        number = _NUMBER_RE.search(user_input)
+        if number:
             try:
-                quantity = int(numbers[0])
+                quantity = int(number.group())
             except ValueError:
                 pass
         
         # Extract color preference
         color = None
-        colors = ['red', 'blue', 'green', 'white', 'black', 'yellow', 'pink', 'purple', 'orange', 'gray', 'grey']
-        for c in colors:
-            if c in user_input:
+        for c in COLOR_WORDS:
+            if c in words:
                 color = c
                 break
         
         # Add products to cart
         added_items = []
-        for product in found_products:
+        for position in found_products:
+            product = catalog.products[position]
             if product.in_stock:
                 # Filter by color if specified and available
-                if color and color not in [c.lower() for c in product.available_colors]:
+                if color and color not in catalog.colors_lower[position]:
                     continue
                 
                 self.add_to_cart(product, quantity)
@@ -807,79 +1293,76 @@ class VoiceShoppingGUI:
         # Handle remove all
         if 'all' in user_input or 'everything' in user_input:
             count = len(st.session_state.cart_items)
-            st.session_state.cart_items.clear()
+            self._clear_cart()
             return f"✅ Removed all {count} items from your cart."
         
         # Extract what to remove
         user_input_lower = user_input.lower()
         
-        # Define product keywords for removal
-        product_keywords = {
-            'shirt': ['shirt', 't-shirt', 'tshirt'],
-            'jeans': ['jeans', 'jean'],
-            'pants': ['pants', 'trousers'],
-            'shoes': ['shoes', 'sneakers', 'boots'],
-            'headphones': ['headphones', 'earphones'],
-            'phone': ['phone', 'smartphone'],
-            'laptop': ['laptop', 'computer'],
-            'dress': ['dress'],
-            'jacket': ['jacket', 'coat']
-        }
-        
         # Find what product type to remove
+        found_keywords = _REMOVE_KEYWORD_SCANNER.scan(user_input_lower)
         product_to_remove = None
-        for product_type, keywords in product_keywords.items():
-            if any(keyword in user_input_lower for keyword in keywords):
+        for product_type, keywords in REMOVE_PRODUCT_KEYWORDS.items():
+            if any(keyword in found_keywords for keyword in keywords):
                 product_to_remove = product_type
                 break
         
         # Extract quantity to remove
         quantity_to_remove = 1  # Default
-        quantity_words = {'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5}
-        for word, num in quantity_words.items():
-            if word in user_input_lower:
+        words = set(_WORD_RE.findall(user_input_lower))
+        for word, num in QUANTITY_WORDS.items():
+            if word in words:
                 quantity_to_remove = num
                 break
         
         # Check for numbers
-        import re
-        numbers = re.findall(r'\d+', user_input_lower)
-        if numbers:
+        number = _NUMBER_RE.search(user_input_lower)
+        if number:
             try:
-                quantity_to_remove = int(numbers[0])
+                quantity_to_remove = int(number.group())
             except ValueError:
                 pass
         
         # Find and remove matching items
         if product_to_remove:
-            keywords = product_keywords[product_to_remove]
+            keywords = REMOVE_PRODUCT_KEYWORDS[product_to_remove]
             removed_items = []
             items_to_remove = []
             
-            # Find items that match the product type
+            # Find items that match the product type, using the catalog's lowercased
+            # names; items not in the catalog fall back to lowering their own name
+            catalog = _product_index()
             for i, item in enumerate(st.session_state.cart_items):
-                if any(keyword in item['name'].lower() for keyword in keywords):
+                position = catalog.positions.get(item['product_id'])
+                if position is not None:
+                    name_lower = catalog.names_lower[position]
+                else:
+                    name_lower = item['name'].lower()
+                if any(keyword in name_lower for keyword in keywords):
                     items_to_remove.append((i, item))
             
             if not items_to_remove:
                 return f"❌ I couldn't find any {product_to_remove} in your cart."
             
-            # Remove the specified quantity
+            # Remove the specified quantity, newest matches first; whole items
+            # are dropped together afterwards so the cart is compacted only once
             removed_count = 0
-            for i, item in reversed(items_to_remove):  # Reverse to maintain indices
+            removed_positions = []
+            for i, item in reversed(items_to_remove):
                 if removed_count >= quantity_to_remove:
                     break
                 
                 if item['quantity'] > 1 and quantity_to_remove == 1:
                     # Reduce quantity by 1
-                    item['quantity'] -= 1
+                    self._set_cart_quantity(item, item['quantity'] - 1)
                     removed_items.append(f"1 {item['name']}")
                     removed_count += 1
                 else:
                     # Remove entire item
-                    removed_item = st.session_state.cart_items.pop(i)
-                    removed_items.append(f"{removed_item['quantity']} {removed_item['name']}")
-                    removed_count += removed_item['quantity']
+                    removed_positions.append(i)
+                    removed_items.append(f"{item['quantity']} {item['name']}")
+                    removed_count += item['quantity']
+            self._remove_cart_positions(removed_positions)
             
             if removed_items:
                 items_text = ", ".join(removed_items)
@@ -889,19 +1372,20 @@ class VoiceShoppingGUI:
         
         # Fallback: if no specific product mentioned, remove last item
         elif 'last' in user_input_lower or 'recent' in user_input_lower:
-            removed_item = st.session_state.cart_items.pop()
+            removed_item = self._pop_cart_item()
             return f"✅ Removed {removed_item['name']} from your cart. You now have {len(st.session_state.cart_items)} items."
         
         else:
             # If no specific item mentioned, ask for clarification
             if len(st.session_state.cart_items) == 1:
                 # Only one item, remove it
-                removed_item = st.session_state.cart_items.pop()
+                removed_item = self._pop_cart_item()
                 return f"✅ Removed {removed_item['name']} from your cart. Your cart is now empty."
             else:
-                # Multiple items, ask for clarification
-                items_list = [f"{item['quantity']}x {item['name']}" for item in st.session_state.cart_items]
-                items_text = ", ".join(items_list)
+                # Multiple items, ask for clarification (the listing is only built here)
+                items_text = ", ".join([
+                    f"{item['quantity']}x {item['name']}" for item in st.session_state.cart_items
+                ])
                 return f"❓ Which item would you like me to remove? Your cart has: {items_text}. Please specify which item to remove."
     
     def handle_show_cart_command(self) -> str:
@@ -909,33 +1393,36 @@ class VoiceShoppingGUI:
         if not st.session_state.cart_items:
             return "🛒 Your cart is empty. Start shopping by asking me to add some items!"
         
-        cart_summary = []
-        total_value = 0
-        
-        for item in st.session_state.cart_items:
-            item_total = item['price'] * item['quantity']
-            total_value += item_total
-            cart_summary.append(f"• {item['quantity']}x {item['name']} - ${item_total:.2f}")
-        
-        summary_text = "\n".join(cart_summary)
-        return f"🛒 **Your Cart ({len(st.session_state.cart_items)} items):**\n{summary_text}\n\n**Total: ${total_value:.2f}**"
+        # Total from the running cart totals; lines built in one comprehension
+        _, total_value = self._cart_totals()
+        summary_text = "\n".join([
+            f"• {item['quantity']}x {item['name']} - ${item['price'] * item['quantity']:.2f}"
+            for item in st.session_state.cart_items
+        ])
+        return CART_REPLY.format(
+            count=len(st.session_state.cart_items), lines=summary_text, total=total_value
+        )
     
     def handle_search_command(self, user_input: str) -> str:
         """Handle search commands"""
+        # Read-only, so identical requests are answered from the reply cache;
+        # commands that change the cart are never cached
+        return _cached_search_reply(self, user_input.lower().strip())
+    
+    def _search_reply(self, user_input: str) -> str:
+        """Run a search request and format the reply"""
         # Extract search terms more carefully
         search_terms = user_input.lower()
         
         # Remove common command words
-        for phrase in ['search for', 'find me', 'look for', 'show me', 'i want', 'get me']:
-            search_terms = search_terms.replace(phrase, '')
+        search_terms = _SEARCH_COMMAND_RE.sub('', search_terms)
         
         # Extract price constraint if mentioned
         price_limit = None
-        import re
-        price_matches = re.findall(r'under\s+\$?(\d+)', search_terms)
-        if price_matches:
-            price_limit = float(price_matches[0])
-            search_terms = re.sub(r'under\s+\$?\d+', '', search_terms)
+        price_match = _PRICE_LIMIT_RE.search(search_terms)
+        if price_match:
+            price_limit = float(price_match.group(1))
+            search_terms = _PRICE_LIMIT_RE.sub('', search_terms)
         
         # Clean up search terms
         search_terms = search_terms.strip()
@@ -943,89 +1430,83 @@ class VoiceShoppingGUI:
         if not search_terms:
             return "What would you like me to search for? Try asking for shirts, jeans, electronics, or any other product!"
         
-        # Use more targeted search with filters
-        filters = {}
-        if price_limit:
-            filters['price_max'] = price_limit
-        
         # Try exact product search first
-        products = []
-        all_products = get_sample_products()
-        
-        # Define product categories for better matching
-        product_categories = {
-            'jeans': ['jeans', 'jean'],
-            'shirt': ['shirt', 't-shirt', 'tshirt'],
-            'shoes': ['shoes', 'sneakers', 'boots'],
-            'headphones': ['headphones', 'earphones'],
-            'phone': ['phone', 'smartphone'],
-            'laptop': ['laptop', 'computer'],
-            'dress': ['dress'],
-            'pants': ['pants', 'trousers'],
-            'jacket': ['jacket', 'coat']
-        }
+        catalog = _product_index()
+        all_products = catalog.products
         
-        # First, try to identify the main product type from search terms
-        main_product_type = None
-        for category, keywords in product_categories.items():
-            if any(keyword in search_terms for keyword in keywords):
-                main_product_type = category
-                break
+        # Price limit as one vectorized mask over the catalog, shared by every branch below
+        within_limit = (catalog.prices <= price_limit).tolist() if price_limit else None
+        
+        # Fast path: the request names one product exactly
+        exact_position = catalog.name_positions.get(search_terms)
+        if exact_position is not None and (within_limit is None or within_limit[exact_position]):
+            exact_product = all_products[exact_position]
+            return self._format_search_results([exact_product], search_terms, price_limit)
+        
+        # First, try to identify the main product type from search terms (one scan)
+        main_product_type = _SEARCH_KEYWORD_SCANNER.first_group(search_terms)
         
         # Look for products matching the specific type
         if main_product_type:
-            category_keywords = product_categories[main_product_type]
-            for product in all_products:
-                # Check if product matches the category
-                if any(keyword in product.name.lower() for keyword in category_keywords):
-                    # Also check for color/attribute matches if specified
-                    search_words = search_terms.split()
-                    color_match = True
-                    
-                    # If color is specified, make sure product has that color
-                    colors = ['red', 'blue', 'green', 'white', 'black', 'yellow', 'pink', 'purple', 'orange', 'gray', 'grey']
-                    specified_colors = [word for word in search_words if word in colors]
-                    
-                    if specified_colors:
-                        # Check if product has the specified color
-                        color_match = any(color in product.available_colors or color in product.name.lower() 
-                                        for color in specified_colors)
-                    
-                    if color_match and (not price_limit or product.price <= price_limit):
-                        products.append(product)
+            positions = catalog.search_category_positions[main_product_type]
+            
+            # If colors are specified, keep products having any of them
+            specified_colors = COLOR_WORD_SET.intersection(search_terms.split())
+            if specified_colors:
+                color_positions = frozenset().union(
+                    *(catalog.color_positions[c] for c in specified_colors)
+                )
+                positions = [i for i in positions if i in color_positions]
+            
+            if within_limit is not None:
+                positions = [i for i in positions if within_limit[i]]
+            products = [all_products[i] for i in positions[:SEARCH_RESULTS_SHOWN]]
         else:
             # Fallback: look for any matches in product names
-            for product in all_products:
-                if any(term in product.name.lower() for term in search_terms.split()):
-                    if not price_limit or product.price <= price_limit:
-                        products.append(product)
+            search_words = search_terms.split()
+            candidates = zip(all_products, catalog.names_lower)
+            if within_limit is not None:
+                candidates = compress(candidates, within_limit)
+            
+            # Only the first few matches are shown, so stop scanning once we have them
+            matches = (
+                product for product, name in candidates
+                if any(term in name for term in search_words)
+            )
+            products = list(islice(matches, SEARCH_RESULTS_SHOWN))
         
         # If no exact matches, use fuzzy search
         if not products:
             if price_limit:
                 # Filter by price first, then search
-                filtered_products = [p for p in all_products if p.price <= price_limit]
+                filtered_products = list(compress(all_products, within_limit))
                 # Create temporary search instance with filtered products
                 temp_search = ProductSearch(filtered_products)
-                products = temp_search.fuzzy_search(search_terms, limit=5)
+                products = temp_search.fuzzy_search(search_terms, limit=SEARCH_RESULTS_SHOWN)
             else:
-                products = self.product_search.fuzzy_search(search_terms, limit=5)
-        
-        # Limit results
-        products = products[:5]
+                products = self.product_search.fuzzy_search(
+                    search_terms, limit=SEARCH_RESULTS_SHOWN
+                )
         
+        return self._format_search_results(products, search_terms, price_limit)
+    
+    def _format_search_results(self, products: List[Product], search_terms: str,
+                               price_limit: Optional[float]) -> str:
+        """Format the chat reply listing search results"""
         if products:
-            results = []
-            for product in products:
-                stock_status = "✅ In Stock" if product.in_stock else "❌ Out of Stock"
-                results.append(f"• {product.name} ({product.brand}) - ${product.price:.2f} {stock_status}")
-            
-            results_text = "\n\n".join(results)  # Double line break for better spacing
+            # Double line break for better spacing
+            results_text = "\n\n".join([
+                f"• {product.name} ({product.brand}) - ${product.price:.2f} "
+                f"{'✅ In Stock' if product.in_stock else '❌ Out of Stock'}"
+                for product in products
+            ])
             price_text = f" under ${price_limit}" if price_limit else ""
-            return f"🔍 **Found {len(products)} products for '{search_terms}'{price_text}:**\n\n{results_text}\n\nYou can ask me to add any of these to your cart!"
+            return SEARCH_RESULTS_REPLY.format(
+                count=len(products), terms=search_terms, price=price_text, lines=results_text
+            )
         else:
             price_text = f" under ${price_limit}" if price_limit else ""
-            return f"❌ Sorry, I couldn't find any products matching '{search_terms}'{price_text}'. Try searching for shirts, electronics, or other categories!"
+            return SEARCH_NO_RESULTS_REPLY.format(terms=search_terms, price=price_text)
     
     def handle_help_command(self) -> str:
         """Handle help commands"""
@@ -1059,7 +1540,7 @@ Just tell me what you want and I'll help you find it! 🛍️"""
             return "Your cart is already empty!"
         
         count = len(st.session_state.cart_items)
-        st.session_state.cart_items.clear()
+        self._clear_cart()
         return f"✅ Cleared your cart! Removed {count} items."
     
     def handle_checkout_command(self) -> str:
@@ -1068,8 +1549,7 @@ Just tell me what you want and I'll help you find it! 🛍️"""
             return "🛒 Your cart is empty! Add some items before checking out. Try saying 'add a shirt' or 'search for products'."
         
         # Calculate cart summary
-        total_items = sum(item['quantity'] for item in st.session_state.cart_items)
-        total_value = sum(item['price'] * item['quantity'] for item in st.session_state.cart_items)
+        total_items, total_value = self._cart_totals()
         
         # Create order summary
         order_summary = []
@@ -1083,7 +1563,7 @@ Just tell me what you want and I'll help you find it! 🛍️"""
         order_id = f"ORD-{int(time.time())}"
         
         # Clear the cart after successful checkout
-        st.session_state.cart_items.clear()
+        self._clear_cart()
         
         # Track the order in session state for reference
         if 'completed_orders' not in st.session_state:
@@ -1110,6 +1590,9 @@ You can continue shopping by asking me to add more items or search for products.
     
     def show_testing_page(self):
         """Display the testing tools page"""
+        # Plotly is only used by this page and analytics; keep it off the cold-start path
+        import plotly.express as px
+        
         st.markdown("## 🧪 Testing Tools")
         
         # Test runner section
@@ -1315,7 +1798,7 @@ You can continue shopping by asking me to add more items or search for products.
         # System status
         st.markdown("### 🔍 System Status")
         
-        catalog_stats = get_catalog_statistics()
+        catalog_stats = _cached_catalog_stats()
         
         col1, col2 = st.columns(2)
         
@@ -1434,51 +1917,36 @@ You can continue shopping by asking me to add more items or search for products.
     
     def show_analytics_page(self):
         """Display analytics and insights page"""
+        # Plotly is only used by this page and testing; keep it off the cold-start path
+        import plotly.graph_objects as go
+        
         st.markdown("## 📊 Analytics & Insights")
         
         # Product catalog analytics
         st.markdown("### 📦 Product Catalog Analysis")
         
-        products = get_sample_products()
-        catalog_stats = get_catalog_statistics()
+        catalog = _product_index()
+        products = catalog.products
+        catalog_stats = _cached_catalog_stats()
         
         # Category distribution
         col1, col2 = st.columns(2)
         
+        # Figures are cached per input data, so reruns reuse them
         with col1:
-            categories_df = pd.DataFrame(
-                list(catalog_stats['categories'].items()),
-                columns=['Category', 'Count']
-            )
-            
-            fig = px.pie(categories_df, values='Count', names='Category', 
-                        title="Products by Category")
+            fig = _category_pie(tuple(catalog_stats['categories'].items()))
             st.plotly_chart(fig, width="stretch")
         
         with col2:
-            # Price distribution
-            prices = [p.price for p in products]
-            fig = px.histogram(x=prices, nbins=20, title="Price Distribution")
-            fig.update_layout(
-                xaxis_title="Price ($)",
-                yaxis_title="Number of Products"
-            )
+            # Price distribution, straight from the index's float64 price column
+            fig = _price_histogram(catalog.prices)
             st.plotly_chart(fig, width="stretch")
         
         # Brand analysis
         st.markdown("### 🏷️ Brand Analysis")
         
-        brand_counts = {}
-        for product in products:
-            brand_counts[product.brand] = brand_counts.get(product.brand, 0) + 1
-        
-        brands_df = pd.DataFrame(
-            list(brand_counts.items()),
-            columns=['Brand', 'Product Count']
-        ).sort_values('Product Count', ascending=False)
-        
-        fig = px.bar(brands_df.head(10), x='Brand', y='Product Count', 
-                    title="Top 10 Brands by Product Count")
+        brand_counts = Counter(product.brand for product in products)
+        fig = _top_brands_bar(tuple(brand_counts.most_common(10)))
         st.plotly_chart(fig, width="stretch")
         
         # Stock analysis
@@ -1505,7 +1973,7 @@ You can continue shopping by asking me to add more items or search for products.
             with col1:
                 st.markdown("**Cart Summary:**")
                 if st.session_state.cart_items:
-                    cart_df = pd.DataFrame(st.session_state.cart_items)
+                    cart_df = self._cart_frame()
                     st.dataframe(cart_df[['name', 'brand', 'quantity', 'price']], 
                                width="stretch")
                 else:
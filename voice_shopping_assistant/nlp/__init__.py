@@ -1,9 +1,10 @@
 """Natural Language Processing module for voice shopping assistant"""
 
-from .intent_classifier import DistilBERTIntentClassifier, create_intent_classifier
+from typing import Any
+
 from .training_data import (
-    TrainingExample, 
-    TrainingDataGenerator, 
+    TrainingExample,
+    TrainingDataGenerator,
     TrainingDataManager,
     create_training_dataset
 )
@@ -12,7 +13,20 @@ __all__ = [
     'DistilBERTIntentClassifier',
     'create_intent_classifier',
     'TrainingExample',
-    'TrainingDataGenerator', 
+    'TrainingDataGenerator',
     'TrainingDataManager',
     'create_training_dataset'
-]
\ No newline at end of file
+]
+
+# Names served from intent_classifier, which pulls in torch/transformers
+_INTENT_CLASSIFIER_EXPORTS = ('DistilBERTIntentClassifier', 'create_intent_classifier')
+
+
+def __getattr__(name: str) -> Any:
+    """Import the intent classifier on first use rather than with the package"""
+    if name in _INTENT_CLASSIFIER_EXPORTS:
+        from . import intent_classifier
+        value = getattr(intent_classifier, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,19 +1,36 @@
 """Conversation context management for multi-turn dialogue"""
 
+import heapq
+import sys
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Set
-from dataclasses import dataclass, field
-from threading import Lock
+from collections import Counter, deque
+from datetime import datetime
+from itertools import chain, islice
+from typing import Deque, Dict, List, Optional, Any, Set, Tuple
+from dataclasses import dataclass, field, fields
+from threading import Lock, RLock
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from ..models.core import Entity, Intent, CartSummary, EntityType, IntentType
 
+# Serialized value -> enum member, bypassing the Enum call path in from_dict
+_ENTITY_TYPE_LOOKUP = {member.value: member for member in EntityType}
+_INTENT_TYPE_LOOKUP = {member.value: member for member in IntentType}
+
+# Slotted records/contexts where supported (dataclass(slots=...) needs Python 3.10+)
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class CommandRecord:
     """Record of a single command in conversation history"""
-    timestamp: datetime
+    timestamp: float  # Epoch seconds (time.time())
     original_text: str
     normalized_text: str
     intent: Intent
@@ -21,17 +38,36 @@ class CommandRecord:
     success: bool
     response: str
     
+    # Lowercased original text and product entity values, NUL-separated so one
+    # substring test covers them all; computed once per record
+    _mention_text: str = field(init=False, repr=False, compare=False)
+    # Records are not modified once added to history, so to_dict is built once
+    _cached_dict: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self):
+        # Normalized commands repeat a small vocabulary; share one copy per string
+        self.normalized_text = sys.intern(self.normalized_text)
+        self._mention_text = '\0'.join(chain(
+            (self.original_text.lower(),),
+            (entity.value.lower() for entity in self.entities
+             if entity.type == EntityType.PRODUCT)
+        ))
+    
     def to_dict(self) -> Dict[str, Any]:
-        """Convert command record to dictionary"""
-        return {
-            "timestamp": self.timestamp.isoformat(),
-            "original_text": self.original_text,
-            "normalized_text": self.normalized_text,
-            "intent": self.intent.to_dict(),
-            "entities": [e.to_dict() for e in self.entities],
-            "success": self.success,
-            "response": self.response
-        }
+        """Convert command record to dictionary (cached; treat as read-only)"""
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(),
+                "original_text": self.original_text,
+                "normalized_text": self.normalized_text,
+                "intent": self.intent.to_dict(),
+                "entities": [e.to_dict() for e in self.entities],
+                "success": self.success,
+                "response": self.response
+            }
+        return self._cached_dict
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'CommandRecord':
@@ -40,8 +76,8 @@ class CommandRecord:
         entities = []
         for e_data in data.get("entities", []):
             entity = Entity(
-                type=EntityType(e_data["type"]),
-                value=e_data["value"],
+                type=_ENTITY_TYPE_LOOKUP[e_data["type"]],
+                value=sys.intern(e_data["value"]),
                 confidence=e_data["confidence"],
                 span=tuple(e_data["span"])
             )
@@ -50,13 +86,13 @@ class CommandRecord:
         # Reconstruct intent
         intent_data = data["intent"]
         intent = Intent(
-            type=IntentType(intent_data["type"]),
+            type=_INTENT_TYPE_LOOKUP[intent_data["type"]],
             confidence=intent_data["confidence"],
             entities=entities
         )
         
         return cls(
-            timestamp=datetime.fromisoformat(data["timestamp"]),
+            timestamp=datetime.fromisoformat(data["timestamp"]).timestamp(),
             original_text=data["original_text"],
             normalized_text=data["normalized_text"],
             intent=intent,
@@ -66,13 +102,14 @@ class CommandRecord:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ConversationContext:
     """Enhanced conversation context for multi-turn dialogue"""
     session_id: str
-    created_at: datetime = field(default_factory=datetime.now)
-    last_activity: datetime = field(default_factory=datetime.now)
-    command_history: List[CommandRecord] = field(default_factory=list)
+    # Epoch seconds (time.time()); serialized as ISO datetimes
+    created_at: float = field(default_factory=time.time)
+    last_activity: float = field(default_factory=time.time)
+    command_history: Deque[CommandRecord] = field(default_factory=deque)
     cart_state: Optional[CartSummary] = None
     user_preferences: Dict[str, Any] = field(default_factory=dict)
     disambiguation_context: Dict[str, Any] = field(default_factory=dict)
@@ -80,45 +117,109 @@ class ConversationContext:
     # Session configuration
     max_history_size: int = 20
     session_timeout_minutes: int = 30
+    # Held by the mutator methods below and by manager exports. Reads and direct
+    # attribute assignment by callers are not locked.
+    _lock: RLock = field(default_factory=RLock, init=False, repr=False, compare=False)
+    
+    # Running statistics over command_history, kept up to date by add_command
+    _intent_counts: Counter = field(init=False, repr=False, compare=False)
+    _success_count: int = field(init=False, repr=False, compare=False)
+    _last_success: Optional[CommandRecord] = field(init=False, repr=False, compare=False)
+    _by_intent: Dict[IntentType, Deque[CommandRecord]] = field(
+        init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self):
+        # Bounded so the oldest command is evicted in O(1) on append
+        self.command_history = deque(self.command_history, maxlen=self.max_history_size)
+        
+        self._intent_counts = Counter()
+        self._success_count = 0
+        self._last_success = None
+        self._by_intent = {}
+        for command in self.command_history:
+            self._count_command(command)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle/copy support: every field except the lock, which can't be copied"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != '_lock'}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore pickled/copied state with a fresh lock"""
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, '_lock', RLock())
+    
+    def _count_command(self, command: CommandRecord) -> None:
+        """Add a command to the running statistics"""
+        self._intent_counts[command.intent.type.value] += 1
+        self._by_intent.setdefault(command.intent.type, deque()).append(command)
+        if command.success:
+            self._success_count += 1
+            self._last_success = command
+    
+    def _forget_command(self, command: CommandRecord) -> None:
+        """Remove an evicted command from the running statistics"""
+        intent_type = command.intent.type.value
+        self._intent_counts[intent_type] -= 1
+        if not self._intent_counts[intent_type]:
+            del self._intent_counts[intent_type]
+        # The evicted record is the oldest overall, so also the oldest of its intent
+        self._by_intent[command.intent.type].popleft()
+        if command.success:
+            self._success_count -= 1
+            # The newest success being evicted means no success is left
+            if self._last_success is command:
+                self._last_success = None
     
     def update_activity(self) -> None:
         """Update last activity timestamp"""
-        self.last_activity = datetime.now()
+        with self._lock:
+            self.last_activity = time.time()
     
     def add_command(self, original_text: str, normalized_text: str, intent: Intent, 
                    entities: List[Entity], success: bool, response: str) -> None:
         """Add command to conversation history"""
-        self.update_activity()
-        
-        command_record = CommandRecord(
-            timestamp=datetime.now(),
-            original_text=original_text,
-            normalized_text=normalized_text,
-            intent=intent,
-            entities=entities,
-            success=success,
-            response=response
-        )
-        
-        self.command_history.append(command_record)
-        
-        # Maintain history size limit
-        if len(self.command_history) > self.max_history_size:
-            self.command_history = self.command_history[-self.max_history_size:]
+        with self._lock:
+            self.update_activity()
+            
+            command_record = CommandRecord(
+                timestamp=self.last_activity,
+                original_text=original_text,
+                normalized_text=normalized_text,
+                intent=intent,
+                entities=entities,
+                success=success,
+                response=response
+            )
+            
+            history = self.command_history
+            self._count_command(command_record)
+            if len(history) == history.maxlen:
+                # Appending evicts the oldest record (or the new one if maxlen is 0)
+                self._forget_command(history[0] if history else command_record)
+            history.append(command_record)
     
     def update_cart_state(self, cart_summary: CartSummary) -> None:
         """Update current cart state"""
-        self.update_activity()
-        self.cart_state = cart_summary
+        with self._lock:
+            self.update_activity()
+            self.cart_state = cart_summary
     
     def is_expired(self) -> bool:
         """Check if session has expired based on timeout"""
-        timeout_threshold = datetime.now() - timedelta(minutes=self.session_timeout_minutes)
-        return self.last_activity < timeout_threshold
+        return time.time() - self.last_activity > self.session_timeout_minutes * 60
+    
+    def expires_at(self) -> float:
+        """Get the epoch time after which the session counts as expired"""
+        return self.last_activity + self.session_timeout_minutes * 60
     
     def get_recent_commands(self, count: int = 5) -> List[CommandRecord]:
         """Get recent commands from history"""
-        return self.command_history[-count:] if self.command_history else []
+        if count <= 0:
+            # Keep list-slice semantics: [-0:] is the whole history, [2:] for count=-2
+            return list(self.command_history)[-count:]
+        return list(islice(reversed(self.command_history), count))[::-1]
     
     def get_recent_entities(self, entity_type: Optional[EntityType] = None, 
                           count: int = 10) -> List[Entity]:
@@ -134,38 +235,24 @@ class ConversationContext:
     
     def get_last_successful_command(self) -> Optional[CommandRecord]:
         """Get the last successful command"""
-        for command in reversed(self.command_history):
-            if command.success:
-                return command
-        return None
+        return self._last_success
     
     def get_commands_by_intent(self, intent_type: IntentType, count: int = 5) -> List[CommandRecord]:
         """Get recent commands of specific intent type"""
-        matching_commands = []
-        for command in reversed(self.command_history):
-            if command.intent.type == intent_type:
-                matching_commands.append(command)
-                if len(matching_commands) >= count:
-                    break
-        return matching_commands
+        return list(islice(reversed(self._by_intent.get(intent_type, ())), count))
     
     def has_recent_product_mentions(self, product_name: str, minutes: int = 5) -> bool:
         """Check if product was mentioned recently"""
-        cutoff_time = datetime.now() - timedelta(minutes=minutes)
+        cutoff_time = time.time() - minutes * 60
+        needle = product_name.lower()
         
         for command in reversed(self.command_history):
             if command.timestamp < cutoff_time:
                 break
             
-            # Check in original text
-            if product_name.lower() in command.original_text.lower():
+            # Check in original text and product entities
+            if needle in command._mention_text:
                 return True
-            
-            # Check in entities
-            for entity in command.entities:
-                if (entity.type == EntityType.PRODUCT and 
-                    product_name.lower() in entity.value.lower()):
-                    return True
         
         return False
     
@@ -181,18 +268,14 @@ class ConversationContext:
             }
         
         total_commands = len(self.command_history)
-        successful_commands = sum(1 for cmd in self.command_history if cmd.success)
+        successful_commands = self._success_count
         success_rate = successful_commands / total_commands if total_commands > 0 else 0.0
         
         # Calculate session duration
-        session_duration = (self.last_activity - self.created_at).total_seconds() / 60
+        session_duration = (self.last_activity - self.created_at) / 60
         
         # Find most common intent
-        intent_counts = {}
-        for command in self.command_history:
-            intent_type = command.intent.type.value
-            intent_counts[intent_type] = intent_counts.get(intent_type, 0) + 1
-        
+        intent_counts = dict(self._intent_counts)
         most_common_intent = max(intent_counts.items(), key=lambda x: x[1])[0] if intent_counts else None
         
         return {
@@ -208,8 +291,8 @@ class ConversationContext:
         """Convert context to dictionary for serialization"""
         return {
             "session_id": self.session_id,
-            "created_at": self.created_at.isoformat(),
-            "last_activity": self.last_activity.isoformat(),
+            "created_at": datetime.fromtimestamp(self.created_at).isoformat(),
+            "last_activity": datetime.fromtimestamp(self.last_activity).isoformat(),
             "command_history": [cmd.to_dict() for cmd in self.command_history],
             "cart_state": self.cart_state.to_dict() if self.cart_state else None,
             "user_preferences": self.user_preferences,
@@ -223,10 +306,9 @@ class ConversationContext:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ConversationContext':
         """Create context from dictionary"""
-        # Reconstruct command history
-        command_history = []
-        for cmd_data in data.get("command_history", []):
-            command_history.append(CommandRecord.from_dict(cmd_data))
+        # Reconstruct command history (bounded to max_history_size in __post_init__)
+        command_history = [CommandRecord.from_dict(cmd_data)
+                           for cmd_data in data.get("command_history", [])]
         
         # Reconstruct cart state if present
         cart_state = None
@@ -236,8 +318,8 @@ class ConversationContext:
         
         context = cls(
             session_id=data["session_id"],
-            created_at=datetime.fromisoformat(data["created_at"]),
-            last_activity=datetime.fromisoformat(data["last_activity"]),
+            created_at=datetime.fromisoformat(data["created_at"]).timestamp(),
+            last_activity=datetime.fromisoformat(data["last_activity"]).timestamp(),
             command_history=command_history,
             cart_state=cart_state,
             user_preferences=data.get("user_preferences", {}),
@@ -250,123 +332,196 @@ class ConversationContext:
 
 
 class ConversationContextManager:
-    """Manager for conversation contexts with session tracking and cleanup"""
+    """Manager for conversation contexts with session tracking and cleanup
+    
+    The session map and expiry heap are guarded by a short-held map lock. Each
+    context carries its own lock for its mutator methods and exports, so those
+    never wait on another session.
+    """
     
     def __init__(self, cleanup_interval_minutes: int = 60):
         self._contexts: Dict[str, ConversationContext] = {}
-        self._lock = Lock()
+        self._map_lock = Lock()
         self.cleanup_interval_minutes = cleanup_interval_minutes
-        self._last_cleanup = datetime.now()
+        self._last_cleanup = time.time()
+        
+        # Min-heap of (expiry time, session_id, version). Only the entry matching a
+        # session's current version is live; older ones are dropped when popped.
+        # Contexts are touched directly by callers, so a live entry may be early; it
+        # is checked against the context when popped and requeued if still active.
+        self._expiry_heap: List[Tuple[float, str, int]] = []
+        self._expiry_versions: Dict[str, int] = {}
     
     def get_context(self, session_id: str) -> ConversationContext:
         """Get or create conversation context for session"""
-        with self._lock:
-            self._cleanup_expired_sessions()
-            
-            if session_id not in self._contexts:
-                self._contexts[session_id] = ConversationContext(session_id=session_id)
-            
-            context = self._contexts[session_id]
-            context.update_activity()
-            return context
+        self._cleanup_expired_sessions()
+        
+        # Fast path: existing sessions are looked up without taking the map lock
+        context = self._contexts.get(session_id)
+        if context is None:
+            with self._map_lock:
+                context = self._contexts.get(session_id)
+                if context is None:
+                    context = ConversationContext(session_id=session_id)
+                    self._contexts[session_id] = context
+                    self._schedule_expiry(session_id, context)
+                    return context
+        
+        context.update_activity()
+        return context
     
     def update_context(self, session_id: str, context: ConversationContext) -> None:
         """Update conversation context"""
-        with self._lock:
+        with self._map_lock:
             self._contexts[session_id] = context
+            self._schedule_expiry(session_id, context)
     
     def remove_context(self, session_id: str) -> bool:
         """Remove conversation context"""
-        with self._lock:
+        with self._map_lock:
             if session_id in self._contexts:
                 del self._contexts[session_id]
+                self._expiry_versions.pop(session_id, None)
                 return True
             return False
     
     def get_active_sessions(self) -> List[str]:
         """Get list of active session IDs"""
-        with self._lock:
-            self._cleanup_expired_sessions()
+        self._cleanup_expired_sessions()
+        with self._map_lock:
             return list(self._contexts.keys())
     
     def get_session_count(self) -> int:
         """Get number of active sessions"""
-        with self._lock:
-            self._cleanup_expired_sessions()
-            return len(self._contexts)
+        self._cleanup_expired_sessions()
+        return len(self._contexts)
+    
+    def _schedule_expiry(self, session_id: str, context: ConversationContext) -> None:
+        """Queue a session's expiry, superseding any earlier entry for it"""
+        version = self._expiry_versions.get(session_id, 0) + 1
+        self._expiry_versions[session_id] = version
+        heapq.heappush(self._expiry_heap, (context.expires_at(), session_id, version))
+    
+    def _remove_expired_sessions(self, now: float) -> int:
+        """Pop due heap entries, removing sessions that really expired
+        
+        Args:
+            now: Current epoch time
+            
+        Returns:
+            Number of sessions removed
+        """
+        heap = self._expiry_heap
+        removed = 0
+        while heap and heap[0][0] < now:
+            _, session_id, version = heapq.heappop(heap)
+            if self._expiry_versions.get(session_id) != version:
+                # Superseded, or the session was removed
+                continue
+            
+            context = self._contexts[session_id]
+            if context.expires_at() < now:
+                del self._contexts[session_id]
+                del self._expiry_versions[session_id]
+                removed += 1
+            else:
+                # Active since it was queued; requeue at its current expiry
+                heapq.heappush(heap, (context.expires_at(), session_id, version))
+        return removed
     
     def _cleanup_expired_sessions(self) -> None:
         """Clean up expired sessions"""
-        now = datetime.now()
-        
         # Only run cleanup if enough time has passed
-        if (now - self._last_cleanup).total_seconds() < self.cleanup_interval_minutes * 60:
+        if time.time() - self._last_cleanup < self.cleanup_interval_minutes * 60:
             return
         
-        expired_sessions = []
-        for session_id, context in self._contexts.items():
-            if context.is_expired():
-                expired_sessions.append(session_id)
-        
-        for session_id in expired_sessions:
-            del self._contexts[session_id]
-        
-        self._last_cleanup = now
+        with self._map_lock:
+            now = time.time()
+            # Another thread may have cleaned up while we waited for the lock
+            if now - self._last_cleanup < self.cleanup_interval_minutes * 60:
+                return
+            
+            self._remove_expired_sessions(now)
+            self._last_cleanup = now
     
     def force_cleanup(self) -> int:
-        """Force cleanup of expired sessions and return count removed"""
-        with self._lock:
-            expired_sessions = []
-            for session_id, context in self._contexts.items():
-                if context.is_expired():
-                    expired_sessions.append(session_id)
-            
-            for session_id in expired_sessions:
+        """Force cleanup of expired sessions and return count removed
+        
+        Checks every session rather than only due heap entries, so sessions whose
+        timeout was shortened after they were queued are caught too.
+        """
+        with self._map_lock:
+            now = time.time()
+            expired = [session_id for session_id, context in self._contexts.items()
+                       if context.expires_at() < now]
+            for session_id in expired:
+                # Their heap entries no longer match a version and are dropped when popped
                 del self._contexts[session_id]
-            
-            self._last_cleanup = datetime.now()
-            return len(expired_sessions)
+                del self._expiry_versions[session_id]
+            self._last_cleanup = now
+            return len(expired)
     
     def get_manager_statistics(self) -> Dict[str, Any]:
         """Get manager statistics"""
-        with self._lock:
-            self._cleanup_expired_sessions()
-            
-            total_sessions = len(self._contexts)
-            total_commands = sum(len(ctx.command_history) for ctx in self._contexts.values())
-            
-            if self._contexts:
-                avg_session_duration = sum(
-                    (ctx.last_activity - ctx.created_at).total_seconds() / 60 
-                    for ctx in self._contexts.values()
-                ) / len(self._contexts)
-                
-                avg_commands_per_session = total_commands / len(self._contexts)
-            else:
-                avg_session_duration = 0
-                avg_commands_per_session = 0
+        self._cleanup_expired_sessions()
+        with self._map_lock:
+            contexts = list(self._contexts.values())
+            last_cleanup = self._last_cleanup
+        
+        total_sessions = len(contexts)
+        total_commands = sum(len(ctx.command_history) for ctx in contexts)
+        
+        if contexts:
+            avg_session_duration = sum(
+                (ctx.last_activity - ctx.created_at) / 60 
+                for ctx in contexts
+            ) / len(contexts)
             
-            return {
-                "active_sessions": total_sessions,
-                "total_commands": total_commands,
-                "avg_session_duration_minutes": round(avg_session_duration, 2),
-                "avg_commands_per_session": round(avg_commands_per_session, 2),
-                "last_cleanup": self._last_cleanup.isoformat()
-            }
+            avg_commands_per_session = total_commands / len(contexts)
+        else:
+            avg_session_duration = 0
+            avg_commands_per_session = 0
+        
+        return {
+            "active_sessions": total_sessions,
+            "total_commands": total_commands,
+            "avg_session_duration_minutes": round(avg_session_duration, 2),
+            "avg_commands_per_session": round(avg_commands_per_session, 2),
+            "last_cleanup": datetime.fromtimestamp(last_cleanup).isoformat()
+        }
     
     def export_session_data(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Export session data for persistence"""
-        with self._lock:
-            if session_id in self._contexts:
-                return self._contexts[session_id].to_dict()
+        context = self._contexts.get(session_id)
+        if context is None:
             return None
+        with context._lock:
+            return context.to_dict()
+    
+    def export_session_json(self, session_id: str) -> Optional[bytes]:
+        """Export session data as UTF-8 JSON, using orjson when installed"""
+        session_data = self.export_session_data(session_id)
+        if session_data is None:
+            return None
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(session_data)
+        return json.dumps(session_data).encode('utf-8')
+    
+    def import_session_json(self, raw: bytes) -> bool:
+        """Import session data from JSON produced by export_session_json"""
+        try:
+            session_data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+        except ValueError:
+            return False
+        return self.import_session_data(session_data)
     
     def import_session_data(self, session_data: Dict[str, Any]) -> bool:
         """Import session data from persistence"""
         try:
             context = ConversationContext.from_dict(session_data)
-            with self._lock:
+            with self._map_lock:
                 self._contexts[context.session_id] = context
+                self._schedule_expiry(context.session_id, context)
             return True
         except Exception:
             return False
@@ -524,11 +524,19 @@ class TrainingDataManager:
             raise ValueError(f"Unsupported file format: {file_path.suffix}")
     
     def _save_to_json(self, examples: List[TrainingExample], file_path: Path) -> None:
-        """Save training data to JSON file"""
-        data = [example.to_dict() for example in examples]
+        """Save training data to JSON file
         
+        Examples are encoded and written one at a time rather than building the
+        whole list of dicts first; the output matches json.dump(..., indent=2).
+        """
         with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write('[')
+            for i, example in enumerate(examples):
+                f.write(',\n  ' if i else '\n  ')
+                # json.dumps escapes newlines inside strings, so every '\n' is layout
+                encoded = json.dumps(example.to_dict(), indent=2, ensure_ascii=False)
+                f.write(encoded.replace('\n', '\n  '))
+            f.write('\n]' if examples else ']')
         
         logger.info(f"Saved {len(examples)} examples to {file_path}")
     
@@ -542,9 +550,7 @@ class TrainingDataManager:
         with open(file_path, 'w', newline='', encoding='utf-8') as f:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
-            
-            for example in examples:
-                writer.writerow(example.to_dict())
+            writer.writerows(example.to_dict() for example in examples)
         
         logger.info(f"Saved {len(examples)} examples to {file_path}")
     